@@ -0,0 +1,219 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import tranosuke.alignment as alignment
+
+
+SAMPLE_DIR = Path(__file__).resolve().parent.parent / "sample" / "sample_mp4"
+
+
+class _EvenSplitPool:
+    """Stands in for AlignmentWorkerPool: spreads the phonemes evenly over the slice."""
+
+    def __init__(self, model_path=None, size: int = 1) -> None:
+        self.size = size
+
+    def align(self, audio_segment, sample_rate: int, phoneme_sequence: str, iterations: int) -> list:
+        duration = len(audio_segment) / sample_rate
+        phonemes = ["pau"] + phoneme_sequence.split() + ["pau"]
+        step = duration / len(phonemes)
+        alignment = [[step * index, step * (index + 1), phoneme] for index, phoneme in enumerate(phonemes)]
+        return [item for item in alignment if item[-1] != "pau"]
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+def _read_outputs(output_dir: Path) -> dict[str, pd.DataFrame]:
+    return {name: pd.read_csv(output_dir / name) for name in ("phoneme.csv", "word.csv")}
+
+
+def test_incremental_alignment_matches_full_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(alignment, "AlignmentWorkerPool", _EvenSplitPool)
+    audio_path = SAMPLE_DIR / "sample_mp4_mono.wav"
+    df_ipu = pd.read_csv(SAMPLE_DIR / "IPU.csv")
+    df_morph = pd.read_csv(SAMPLE_DIR / "morpheme.csv")
+
+    first_dir = tmp_path / "first"
+    alignment.align_phonemes_and_words(audio_path, df_ipu, df_morph, output_dir=first_dir)
+
+    edited_morph = df_morph.copy()
+    edited_morph.loc[edited_morph.index[-1], "phonemes"] += " o"
+
+    incremental_dir = tmp_path / "incremental"
+    full_dir = tmp_path / "full"
+    alignment.align_phonemes_and_words(
+        audio_path, df_ipu, edited_morph, output_dir=incremental_dir, previous_dir=first_dir
+    )
+    alignment.align_phonemes_and_words(audio_path, df_ipu, edited_morph, output_dir=full_dir)
+
+    incremental = _read_outputs(incremental_dir)
+    full = _read_outputs(full_dir)
+    for name in full:
+        pd.testing.assert_frame_equal(incremental[name], full[name], check_exact=True, obj=name)
+
+
+def _flaky_pool(always_failing: set[str], failing_once: set[str]):
+    """An _EvenSplitPool that rejects the given IPU phoneme sequences, always or on the first try."""
+
+    class _FlakyPool(_EvenSplitPool):
+        def __init__(self, model_path=None, size: int = 1) -> None:
+            super().__init__(model_path, size)
+            self.failed_once: set[str] = set()
+
+        def align(self, audio_segment, sample_rate: int, phoneme_sequence: str, iterations: int) -> list:
+            if phoneme_sequence in always_failing:
+                raise RuntimeError("alignment failed")
+            if phoneme_sequence in failing_once and phoneme_sequence not in self.failed_once:
+                self.failed_once.add(phoneme_sequence)
+                raise RuntimeError("alignment failed")
+            return super().align(audio_segment, sample_rate, phoneme_sequence, iterations)
+
+    return _FlakyPool
+
+
+def test_incremental_alignment_realigns_failed_ipus_and_keeps_retries(tmp_path, monkeypatch):
+    audio_path = SAMPLE_DIR / "sample_mp4_mono.wav"
+    df_ipu = pd.read_csv(SAMPLE_DIR / "IPU.csv").assign(filename="001")
+    df_morph = pd.read_csv(SAMPLE_DIR / "morpheme.csv")
+    sequences = df_morph.groupby("IPUID")["phonemes"].apply(" ".join).tolist()
+    failed_sequence, retried_sequence = sequences[0], sequences[1]
+
+    output_dir = tmp_path / "out"
+    full_dir = tmp_path / "full"
+    monkeypatch.setattr(alignment, "AlignmentWorkerPool", _flaky_pool({failed_sequence}, {retried_sequence}))
+    alignment.align_phonemes_and_words(audio_path, df_ipu, df_morph, output_dir=output_dir)
+    monkeypatch.setattr(alignment, "AlignmentWorkerPool", _flaky_pool(set(), {retried_sequence}))
+    alignment.align_phonemes_and_words(audio_path, df_ipu, df_morph, output_dir=output_dir, previous_dir=output_dir)
+    alignment.align_phonemes_and_words(audio_path, df_ipu, df_morph, output_dir=full_dir)
+
+    for name in ("phoneme.csv", "word.csv", "alignment_retries.csv"):
+        incremental = pd.read_csv(output_dir / name, dtype=str, keep_default_na=False)
+        full = pd.read_csv(full_dir / name, dtype=str, keep_default_na=False)
+        pd.testing.assert_frame_equal(incremental, full, check_exact=True, obj=name)
+    retries = pd.read_csv(output_dir / "alignment_retries.csv")
+    assert retries["status"].tolist() == ["retried"]
+
+
+@pytest.mark.parametrize("alignment_buffer_s", [0.1234, 0.1 + 1e-9])
+def test_unrounded_buffer_without_failures_records_no_retries(tmp_path, monkeypatch, alignment_buffer_s):
+    monkeypatch.setattr(alignment, "AlignmentWorkerPool", _EvenSplitPool)
+    result = alignment.align_phonemes_and_words(
+        SAMPLE_DIR / "sample_mp4_mono.wav",
+        pd.read_csv(SAMPLE_DIR / "IPU.csv"),
+        pd.read_csv(SAMPLE_DIR / "morpheme.csv"),
+        output_dir=tmp_path,
+        alignment_buffer_s=alignment_buffer_s,
+    )
+    assert result["alignment_retries_df"].empty
+
+
+def test_incremental_joint_alignment_matches_full_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(alignment, "AlignmentWorkerPool", _EvenSplitPool)
+    audio_path = SAMPLE_DIR / "sample_mp4_mono.wav"
+    df_ipu = pd.read_csv(SAMPLE_DIR / "IPU.csv")
+    df_morph = pd.read_csv(SAMPLE_DIR / "morpheme.csv")
+
+    sorted_ipus = df_ipu.sort_values("startTime")
+    starts = sorted_ipus["startTime"].to_numpy(dtype=float)
+    ends = sorted_ipus["endTime"].to_numpy(dtype=float)
+    previous_boundaries, next_boundaries = alignment._neighbour_boundaries(starts, ends, starts, ends, float("inf"))
+    jobs = [
+        (row, "", previous_boundary, next_boundary)
+        for row, previous_boundary, next_boundary in zip(
+            sorted_ipus.to_dict("records"), previous_boundaries, next_boundaries
+        )
+    ]
+    group = next(group for group in alignment._joint_alignment_groups(jobs) if len(group) > 1)
+    edited_ipu = jobs[group[-1]][0]["IPUID"]
+
+    first_dir = tmp_path / "first"
+    alignment.align_phonemes_and_words(audio_path, df_ipu, df_morph, output_dir=first_dir, joint_alignment=True)
+
+    edited_morph = df_morph.copy()
+    edited_rows = edited_morph.index[edited_morph["IPUID"] == edited_ipu]
+    edited_morph.loc[edited_rows[-1], "phonemes"] += " o"
+
+    incremental_dir = tmp_path / "incremental"
+    full_dir = tmp_path / "full"
+    alignment.align_phonemes_and_words(
+        audio_path,
+        df_ipu,
+        edited_morph,
+        output_dir=incremental_dir,
+        previous_dir=first_dir,
+        joint_alignment=True,
+    )
+    alignment.align_phonemes_and_words(audio_path, df_ipu, edited_morph, output_dir=full_dir, joint_alignment=True)
+
+    incremental = _read_outputs(incremental_dir)
+    full = _read_outputs(full_dir)
+    for name in full:
+        pd.testing.assert_frame_equal(incremental[name], full[name], check_exact=True, obj=name)
+    assert not _read_outputs(first_dir)["phoneme.csv"].equals(full["phoneme.csv"])
+
+
+@pytest.mark.parametrize(
+    ("alignment_dir", "morpheme_csv"),
+    [
+        (SAMPLE_DIR, SAMPLE_DIR / "morpheme.csv"),
+        (
+            SAMPLE_DIR.parent / "manual_workflow_test" / "alignment_from_manual_ipu",
+            SAMPLE_DIR.parent / "manual_workflow_test" / "morpheme.csv",
+        ),
+    ],
+)
+def test_build_word_alignment_reproduces_sample_word_csv(alignment_dir, morpheme_csv):
+    df_phon = pd.read_csv(alignment_dir / "phoneme.csv")
+    df_phon["IPUID"] = pd.read_csv(alignment_dir / "phoneme2IPU.csv")["IPUID"].to_numpy()
+    df_morph = pd.read_csv(morpheme_csv)
+    df_ipu = pd.read_csv(alignment_dir / "IPU.csv")
+
+    df_word = alignment.build_word_alignment(df_morph[df_morph["orth"] != "¥"].copy(), df_phon)
+    df_word = alignment._force_group_edges_to_ipu_boundaries(df_word, df_ipu, "wordID")
+    df_word = df_word.drop(columns=["IPUID", "nth", "len"], errors="ignore").reset_index(drop=True)
+
+    pd.testing.assert_frame_equal(df_word, pd.read_csv(alignment_dir / "word.csv"), check_exact=True)
+
+
+def _match_phoneme_sequences_per_ipu(phoneme_codes, phoneme_offsets, target_codes, target_offsets):
+    """The per-IPU scan build_word_alignment ran before matching was batched, kept as a reference."""
+    matched = [-1] * len(target_codes)
+    for ipu in range(len(phoneme_offsets) - 1):
+        phoneme_list = list(phoneme_codes[phoneme_offsets[ipu]:phoneme_offsets[ipu + 1]])
+        targets = list(range(target_offsets[ipu], target_offsets[ipu + 1]))
+        phoneme_index = 0
+        match_index = 0
+        while phoneme_index < len(phoneme_list) and match_index < len(targets):
+            if phoneme_list[phoneme_index] == target_codes[targets[match_index]]:
+                matched[targets[match_index]] = phoneme_offsets[ipu] + phoneme_index
+                match_index += 1
+            phoneme_index += 1
+    return np.array(matched, dtype=np.int64)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_match_phoneme_sequences_matches_per_ipu_scan(seed):
+    rng = np.random.default_rng(seed)
+    n_ipus = int(rng.integers(1, 12))
+    n_codes = int(rng.integers(1, 6))
+    phoneme_counts = rng.integers(0, 15, size=n_ipus)
+    target_counts = rng.integers(0, 15, size=n_ipus)
+    phoneme_offsets = np.concatenate(([0], np.cumsum(phoneme_counts)))
+    target_offsets = np.concatenate(([0], np.cumsum(target_counts)))
+    phoneme_codes = rng.integers(0, n_codes, size=phoneme_offsets[-1])
+    target_codes = rng.integers(0, n_codes + 1, size=target_offsets[-1])
+
+    np.testing.assert_array_equal(
+        alignment._match_phoneme_sequences(phoneme_codes, phoneme_offsets, target_codes, target_offsets),
+        _match_phoneme_sequences_per_ipu(phoneme_codes, phoneme_offsets, target_codes, target_offsets),
+    )
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from tranosuke.audio import AudioSource, open_audio
+
+
+def test_audio_source_requires_read():
+    with pytest.raises(TypeError):
+        AudioSource(Path("missing.wav"), 16000, 0, 1)
+
+
+def test_open_audio_reads_spans_as_context_manager(tmp_path):
+    path = tmp_path / "stereo.wav"
+    samples = np.stack([np.linspace(-0.5, 0.5, 1600), np.zeros(1600)], axis=1)
+    sf.write(path, samples, 16000, subtype="FLOAT")
+
+    with open_audio(path) as audio_source:
+        assert audio_source.sample_rate == 16000
+        assert len(audio_source) == 1600
+        np.testing.assert_allclose(audio_source.read(100, 200), samples[100:200, 0] / 2, atol=1e-6)
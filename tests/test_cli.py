@@ -0,0 +1,16 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_importing_cli_skips_heavy_modules():
+    heavy = ["torch", "pandas", "numpy", "MeCab"]
+    script = f"import sys, tranosuke.cli; print(sorted(set({heavy!r}) & set(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    )
+    assert result.stdout.strip() == "[]"
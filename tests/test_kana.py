@@ -0,0 +1,31 @@
+import pytest
+
+from tranosuke.kana import kana_to_phonemes
+
+
+@pytest.mark.parametrize(
+    ("reading", "expected"),
+    [
+        ("アー", "a a"),
+        ("エート", "e e t o"),
+        ("ンー", "N N"),
+        ("ンート", "N N t o"),
+        ("んーと", "N N t o"),
+        ("ウンー", "u N N"),
+        ("ッー", "cl cl"),
+        ("ーア", ""),
+        ("ツカッ", "ts u k a cl"),
+    ],
+)
+def test_long_vowel_mark_repeats_previous_phoneme(reading, expected):
+    assert kana_to_phonemes(reading) == expected
+
+
+@pytest.mark.parametrize("reading", ["アー", "エート", "ンー", "ンート", "んーと", "ウンー", "ンンー", "ソー"])
+def test_long_vowel_mark_matches_legacy(reading):
+    pykakasi = pytest.importorskip("pykakasi")
+    pytest.importorskip("MeCab")
+    from tranosuke.morphology import reading_to_phonemes
+
+    legacy = reading_to_phonemes(reading, pykakasi.kakasi(), legacy=True)
+    assert kana_to_phonemes(reading) == legacy
@@ -0,0 +1,103 @@
+"""
+Time ``python -m tranosuke <command> --help`` for every CLI subcommand.
+
+Each git revision given on the command line is exported to a temporary
+directory and timed there; without revisions the working tree is timed.
+Compare a revision before and after a startup change, for example:
+
+    python tools/bench_cli_startup.py 8262ada^ HEAD --repeat 10
+"""
+import argparse
+import os
+from pathlib import Path
+import re
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _export_revision(revision: str, target_dir: Path) -> Path:
+    archive = subprocess.run(
+        ["git", "-C", str(REPO_ROOT), "archive", "--format=tar", revision, "tranosuke"],
+        capture_output=True,
+        check=True,
+    )
+    archive_path = target_dir / "source.tar"
+    archive_path.write_bytes(archive.stdout)
+    with tarfile.open(archive_path) as archive_file:
+        archive_file.extractall(target_dir)
+    return target_dir
+
+
+def _run_cli(source_dir: Path, args: list[str]) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(source_dir)}
+    return subprocess.run(
+        [sys.executable, "-m", "tranosuke", *args],
+        cwd=source_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def _subcommands(source_dir: Path) -> list[str]:
+    result = _run_cli(source_dir, ["--help"])
+    match = re.search(r"\{([^}]*)\}", result.stdout)
+    if result.returncode != 0 or match is None:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "no subcommands")
+    return match.group(1).split(",")
+
+
+def _time_command(source_dir: Path, command: str, repeat: int) -> float | None:
+    """Median wall time in seconds, or None when the command fails."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = _run_cli(source_dir, [command, "--help"])
+        timings.append(time.perf_counter() - started)
+        if result.returncode != 0:
+            return None
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("revisions", nargs="*", help="git revisions to compare (default: the working tree)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="tranosuke_bench_") as temp_dir:
+        sources = {"working tree": REPO_ROOT}
+        if args.revisions:
+            sources = {}
+            for index, revision in enumerate(args.revisions):
+                target_dir = Path(temp_dir) / str(index)
+                target_dir.mkdir()
+                sources[revision] = _export_revision(revision, target_dir)
+
+        commands: list[str] = []
+        for label, source_dir in sources.items():
+            try:
+                commands.extend(command for command in _subcommands(source_dir) if command not in commands)
+            except RuntimeError as error:
+                print(f"{label}: tranosuke does not start: {error}", file=sys.stderr)
+
+        labels = list(sources)
+        print("command".ljust(14) + "".join(label[:14].rjust(16) for label in labels))
+        for command in commands:
+            cells = []
+            for source_dir in sources.values():
+                seconds = _time_command(source_dir, command, args.repeat)
+                cells.append("failed" if seconds is None else f"{seconds * 1000:.0f} ms")
+            print(command.ljust(14) + "".join(cell.rjust(16) for cell in cells))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
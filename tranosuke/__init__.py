@@ -1,24 +1,63 @@
-from tranosuke.alignment import align_phonemes_and_words
-from tranosuke.config import (
-    AppPaths,
-    ensure_denoise_runtime,
-    get_app_paths,
-    initialize_app,
-    read_user_config,
-    save_huggingface_token,
-)
-from tranosuke.corpus import build_corpus
-from tranosuke.denoise import denoise_media, denoise_wav
-from tranosuke.luu import build_luus, build_luus_from_word_csv
-from tranosuke.media import convert_media_to_wavs
-from tranosuke.morphology import analyze_ipu_csv, analyze_ipus
-from tranosuke.transcription import transcribe_ipus, transcribe_media_to_ipu_csv
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tranosuke.alignment import align_phonemes_and_words
+    from tranosuke.config import (
+        AppPaths,
+        ensure_denoise_runtime,
+        get_app_paths,
+        initialize_app,
+        read_user_config,
+        save_huggingface_token,
+    )
+    from tranosuke.corpus import build_corpus
+    from tranosuke.denoise import denoise_media, denoise_wav
+    from tranosuke.luu import build_luus, build_luus_from_word_csv
+    from tranosuke.media import convert_media_to_wavs
+    from tranosuke.models import evict_models
+    from tranosuke.morphology import analyze_ipu_csv, analyze_ipus
+    from tranosuke.profiles import PERFORMANCE_PROFILES
+    from tranosuke.transcription import (
+        autotune_performance_profile,
+        transcribe_channel_ipus,
+        transcribe_ipus,
+        transcribe_media_to_ipu_csv,
+    )
+
+# Public name -> defining module. Modules are imported on first attribute
+# access, so ``import tranosuke`` does not pull in Whisper, pyannote or MeCab.
+_EXPORTS = {
+    "AppPaths": "tranosuke.config",
+    "PERFORMANCE_PROFILES": "tranosuke.profiles",
+    "align_phonemes_and_words": "tranosuke.alignment",
+    "analyze_ipu_csv": "tranosuke.morphology",
+    "analyze_ipus": "tranosuke.morphology",
+    "autotune_performance_profile": "tranosuke.transcription",
+    "build_corpus": "tranosuke.corpus",
+    "build_luus": "tranosuke.luu",
+    "build_luus_from_word_csv": "tranosuke.luu",
+    "convert_media_to_wavs": "tranosuke.media",
+    "denoise_media": "tranosuke.denoise",
+    "denoise_wav": "tranosuke.denoise",
+    "ensure_denoise_runtime": "tranosuke.config",
+    "evict_models": "tranosuke.models",
+    "get_app_paths": "tranosuke.config",
+    "initialize_app": "tranosuke.config",
+    "read_user_config": "tranosuke.config",
+    "save_huggingface_token": "tranosuke.config",
+    "transcribe_channel_ipus": "tranosuke.transcription",
+    "transcribe_ipus": "tranosuke.transcription",
+    "transcribe_media_to_ipu_csv": "tranosuke.transcription",
+}
 
 __all__ = [
     "AppPaths",
+    "PERFORMANCE_PROFILES",
     "align_phonemes_and_words",
     "analyze_ipu_csv",
     "analyze_ipus",
+    "autotune_performance_profile",
     "build_corpus",
     "build_luus",
     "build_luus_from_word_csv",
@@ -26,10 +65,25 @@ __all__ = [
     "denoise_media",
     "denoise_wav",
     "ensure_denoise_runtime",
+    "evict_models",
     "get_app_paths",
     "initialize_app",
     "read_user_config",
     "save_huggingface_token",
+    "transcribe_channel_ipus",
     "transcribe_ipus",
     "transcribe_media_to_ipu_csv",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,51 +1,455 @@
+import hashlib
 import json
+import queue
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
-import soundfile as sf
-
+from tranosuke.audio import AudioSource, open_audio
 from tranosuke.config import get_app_paths
-from tranosuke.utils import float_to_timecode
+from tranosuke.utils import floats_to_timecodes
+
+
+class _AlignmentWorker:
+    """One long-lived ``alignment_worker.py --serve`` process with pydomino loaded."""
 
+    def __init__(self, model_path: Path) -> None:
+        self.model_path = Path(model_path)
+        self._process: subprocess.Popen | None = None
+        self._stderr = None
 
-def _align_phoneme_sequence(
-    audio_segment,
-    sample_rate: int,
+    def _start(self) -> subprocess.Popen:
+        worker_path = Path(__file__).with_name("alignment_worker.py")
+        self._stderr = tempfile.TemporaryFile()
+        self._process = subprocess.Popen(
+            [sys.executable, str(worker_path), "--serve", str(self.model_path)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+        )
+        return self._process
+
+    def _crashed(self) -> RuntimeError:
+        process = self._process
+        returncode = process.poll() if process is not None else None
+        if process is not None and returncode is None:
+            process.kill()
+            returncode = process.wait()
+        stderr = ""
+        if self._stderr is not None:
+            self._stderr.seek(0)
+            stderr = self._stderr.read().decode("utf-8", errors="replace")
+            self._stderr.close()
+        self._process = None
+        self._stderr = None
+        return RuntimeError(f"pydomino alignment subprocess failed with code {returncode}: {stderr}")
+
+    def align(self, audio_segment, sample_rate: int, phoneme_sequence: str, iterations: int) -> list:
+        process = self._process
+        if process is None or process.poll() is not None:
+            process = self._start()
+
+        samples = np.asarray(audio_segment, dtype=np.float32)
+        if samples.ndim > 1:
+            samples = samples.mean(axis=1)
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        header = {
+            "phoneme_sequence": phoneme_sequence,
+            "iterations": int(iterations),
+            "sample_rate": int(sample_rate),
+            "num_samples": int(samples.shape[0]),
+        }
+        try:
+            process.stdin.write(json.dumps(header).encode("utf-8") + b"\n")
+            process.stdin.write(samples.tobytes())
+            process.stdin.flush()
+            line = process.stdout.readline()
+        except (BrokenPipeError, OSError):
+            raise self._crashed() from None
+        if not line:
+            raise self._crashed()
+
+        reply = json.loads(line)
+        if "error" in reply:
+            raise RuntimeError(f"pydomino alignment failed: {reply['error']}")
+        return reply["alignment"]
+
+    def close(self) -> None:
+        process = self._process
+        self._process = None
+        if process is not None:
+            try:
+                process.stdin.close()
+                process.wait(timeout=10)
+            except Exception:
+                process.kill()
+                process.wait()
+        if self._stderr is not None:
+            self._stderr.close()
+            self._stderr = None
+
+
+class AlignmentWorkerPool:
+    """
+    Pool of persistent pydomino worker processes.
+
+    Each worker loads the aligner once and then receives audio slices over a
+    pipe. A worker that crashes only fails the request it was handling and is
+    restarted on its next request.
+    """
+
+    def __init__(self, model_path: str | Path, size: int = 1) -> None:
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self._workers = [_AlignmentWorker(Path(model_path)) for _ in range(size)]
+        # Most recently used first, so workers are only started when all started ones are busy.
+        self._idle: queue.LifoQueue[_AlignmentWorker] = queue.LifoQueue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self._workers)
+
+    def align(self, audio_segment, sample_rate: int, phoneme_sequence: str, iterations: int) -> list:
+        worker = self._idle.get()
+        try:
+            alignment = worker.align(audio_segment, sample_rate, phoneme_sequence, iterations)
+        finally:
+            self._idle.put(worker)
+        return [item for item in alignment if item[-1] != "pau"]
+
+    def close(self) -> None:
+        with self._lock:
+            for worker in self._workers:
+                worker.close()
+
+    def __enter__(self) -> "AlignmentWorkerPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _neighbour_boundaries(
+    start_times: np.ndarray,
+    end_times: np.ndarray,
+    ipu_starts: np.ndarray,
+    ipu_ends: np.ndarray,
+    default_end: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    For every IPU, return the latest end time at or before its start and the
+    earliest start time at or after its end, across all IPUs and speakers.
+
+    Missing neighbours fall back to 0.0 and ``default_end``.
+    """
+    # Pad with the fallbacks so that "no neighbour" indexes the sentinel.
+    sorted_ends = np.concatenate(([0.0], np.sort(end_times[~np.isnan(end_times)])))
+    sorted_starts = np.concatenate((np.sort(start_times[~np.isnan(start_times)]), [default_end]))
+
+    previous_boundaries = sorted_ends[np.searchsorted(sorted_ends[1:], ipu_starts, side="right")]
+    next_boundaries = sorted_starts[np.searchsorted(sorted_starts[:-1], ipu_ends, side="left")]
+    previous_boundaries[np.isnan(ipu_starts)] = 0.0
+    next_boundaries[np.isnan(ipu_ends)] = default_end
+    return previous_boundaries, next_boundaries
+
+
+ALIGNMENT_BUFFER_MULTIPLIERS = (2.0, 4.0)
+ALIGNMENT_STATE_FILENAME = "alignment_state.csv"
+ALIGNMENT_RETRIES_FILENAME = "alignment_retries.csv"
+# Phoneme rows as aligned, before IPU edge snapping, kept for incremental reuse.
+ALIGNMENT_ROWS_FILENAME = "alignment_rows.csv"
+ALIGNMENT_ROW_COLUMNS = ["filename", "speaker", "IPUID", "startTime", "endTime", "phoneme"]
+JOINT_ALIGNMENT_MAX_GAP_S = 1.0
+JOINT_ALIGNMENT_MAX_SPAN_S = 10.0
+ALIGNMENT_RETRY_COLUMNS = ["filename", "speaker", "IPUID", "startTime", "endTime", "attempts", "buffer", "status"]
+
+
+def _buffer_attempts(
+    ipu_start: float,
+    ipu_end: float,
+    alignment_buffer_s: float,
+    previous_boundary: float,
+    next_boundary: float,
+) -> list[float]:
+    max_left_buffer = max(ipu_start - previous_boundary, 0.0)
+    max_right_buffer = max(next_boundary - ipu_end, 0.0)
+    max_available_buffer = max(max_left_buffer, max_right_buffer, alignment_buffer_s)
+    buffer_attempts = [alignment_buffer_s]
+    for multiplier in ALIGNMENT_BUFFER_MULTIPLIERS:
+        buffer_attempts.append(alignment_buffer_s * multiplier)
+    buffer_attempts.append(max_available_buffer)
+    return sorted({round(max(buffer, 0.0), 3) for buffer in buffer_attempts})
+
+
+def _align_ipu(
+    worker_pool: AlignmentWorkerPool,
+    audio_source: AudioSource,
+    ipu_row: dict,
     phoneme_sequence: str,
     iterations: int,
-    model_path: Path,
-) -> list:
-    worker_path = Path(__file__).with_name("alignment_worker.py")
-    with tempfile.TemporaryDirectory(prefix="tranosuke_align_") as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        request_path = tmp_path / "request.json"
-        segment_path = tmp_path / "segment.wav"
-        output_path = tmp_path / "output.json"
-        request_path.write_text(
-            json.dumps(
-                {
-                    "model_path": str(model_path),
-                    "phoneme_sequence": phoneme_sequence,
-                    "iterations": iterations,
-                }
-            )
+    alignment_buffer_s: float,
+    previous_boundary: float,
+    next_boundary: float,
+    retry_executor: ThreadPoolExecutor | None = None,
+) -> tuple[list[list], dict | None]:
+    """
+    Align one IPU, widening the buffer on failure.
+
+    Returns the phoneme rows and, when the first buffer did not succeed, a
+    retry record. The default buffer is always tried first, alone. With
+    ``retry_executor``, once it fails all wider buffers are tried at once
+    and the smallest one that succeeds wins; attempts that have not started
+    yet are cancelled.
+    """
+    ipu_id = ipu_row["IPUID"]
+    sample_rate = audio_source.sample_rate
+    audio_duration = audio_source.duration
+    ipu_start = max(float(ipu_row["startTime"]), 0.0)
+    ipu_end = min(float(ipu_row["endTime"]), audio_duration)
+
+    attempts = []
+    for buffer_s in _buffer_attempts(ipu_start, ipu_end, alignment_buffer_s, previous_boundary, next_boundary):
+        attempt_start = max(ipu_start - buffer_s, previous_boundary, 0.0)
+        attempt_end = min(ipu_end + buffer_s, next_boundary, audio_duration)
+        start_sample = max(int(attempt_start * sample_rate), 0)
+        end_sample = min(int(attempt_end * sample_rate), len(audio_source))
+        if end_sample <= start_sample:
+            continue
+        attempts.append((buffer_s, attempt_start, start_sample, end_sample))
+
+    def run_attempt(attempt) -> list:
+        _, _, start_sample, end_sample = attempt
+        return worker_pool.align(
+            audio_source.read(start_sample, end_sample), sample_rate, phoneme_sequence, iterations
         )
-        sf.write(segment_path, audio_segment, sample_rate)
-        result = subprocess.run(
-            [sys.executable, str(worker_path), str(request_path), str(segment_path), str(output_path)],
-            capture_output=True,
-            text=True,
+
+    futures = {}
+    phonemes = None
+    alignment_start = ipu_start
+    tried_buffers = []
+    for position, attempt in enumerate(attempts):
+        buffer_s, attempt_start, _, _ = attempt
+        tried_buffers.append(buffer_s)
+        if position == 1 and retry_executor is not None and len(attempts) > 2:
+            futures = {
+                later: retry_executor.submit(run_attempt, attempts[later]) for later in range(1, len(attempts))
+            }
+        try:
+            phonemes = futures[position].result() if position in futures else run_attempt(attempt)
+            alignment_start = attempt_start
+            if position > 0:
+                print(f"alignment retry succeeded: {ipu_id} buffer={buffer_s:.3f}s")
+            break
+        except Exception as error:
+            print(f"alignment failed: {ipu_id} buffer={buffer_s:.3f}s {error}")
+
+    for later, future in futures.items():
+        if later >= len(tried_buffers):
+            future.cancel()
+
+    retry_record = None
+    # Buffers are rounded in _buffer_attempts, so count attempts rather than compare values.
+    if phonemes is None or len(tried_buffers) > 1:
+        retry_record = {
+            "filename": ipu_row["filename"],
+            "speaker": ipu_row["speaker"],
+            "IPUID": ipu_id,
+            "startTime": ipu_row["startTime"],
+            "endTime": ipu_row["endTime"],
+            "attempts": " ".join(f"{buffer_s:.3f}" for buffer_s in tried_buffers),
+            "buffer": tried_buffers[-1] if phonemes is not None else None,
+            "status": "retried" if phonemes is not None else "failed",
+        }
+
+    if phonemes is None:
+        return [], retry_record
+
+    rows = [
+        [
+            ipu_row["filename"],
+            ipu_row["speaker"],
+            ipu_id,
+            round(float(start_time) + alignment_start, 4),
+            round(float(end_time) + alignment_start, 4),
+            phoneme,
+        ]
+        for start_time, end_time, phoneme in phonemes
+    ]
+    return rows, retry_record
+
+
+def _ipu_signature(
+    ipu_row: dict,
+    phoneme_sequence: str,
+    previous_boundary: float,
+    next_boundary: float,
+    alignment_buffer_s: float,
+    iterations: int,
+    joint_alignment: bool = False,
+) -> str:
+    """Hash everything that feeds into one IPU's phoneme alignment."""
+    payload = json.dumps(
+        [
+            str(ipu_row["filename"]),
+            str(ipu_row["speaker"]),
+            str(ipu_row["IPU"]),
+            float(ipu_row["startTime"]),
+            float(ipu_row["endTime"]),
+            phoneme_sequence,
+            previous_boundary,
+            next_boundary,
+            alignment_buffer_s,
+            int(iterations),
+        ]
+        + (["joint"] if joint_alignment else []),
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_previous_alignment(previous_dir: str | Path) -> dict[str, tuple[str, list[list], dict | None]]:
+    """
+    Read an earlier ``align_phonemes_and_words`` output directory.
+
+    Returns ``{IPUID: (signature, phoneme rows, retry record)}`` for every IPU
+    recorded in ``alignment_state.csv`` that produced rows; IPUs whose
+    alignment failed are left out so they are aligned again. The rows come
+    from ``alignment_rows.csv``, which holds them as aligned, before the IPU
+    edges were snapped: snapping already snapped rows again does not always
+    give the same result. The retry record, if any, comes from
+    ``alignment_retries.csv``. Outputs without the state and rows files
+    yield an empty mapping, so everything is realigned.
+    """
+    source_dir = Path(previous_dir).expanduser().resolve()
+    state_csv = source_dir / ALIGNMENT_STATE_FILENAME
+    rows_csv = source_dir / ALIGNMENT_ROWS_FILENAME
+    retries_csv = source_dir / ALIGNMENT_RETRIES_FILENAME
+    if not (state_csv.exists() and rows_csv.exists()):
+        return {}
+
+    df_state = pd.read_csv(state_csv, dtype={"IPUID": str, "signature": str})
+    text_columns = {"filename": str, "speaker": str, "IPUID": str}
+    df_rows = pd.read_csv(
+        rows_csv,
+        dtype={**text_columns, "phoneme": str},
+        keep_default_na=False,
+        na_values={"startTime": [""], "endTime": [""]},
+    )
+    phoneme_rows: dict[str, list[list]] = {}
+    for row in df_rows[ALIGNMENT_ROW_COLUMNS].itertuples(index=False):
+        phoneme_rows.setdefault(row.IPUID, []).append(list(row))
+
+    retry_records: dict[str, dict] = {}
+    if retries_csv.exists():
+        df_retries = pd.read_csv(
+            retries_csv,
+            dtype={**text_columns, "attempts": str, "status": str},
+            keep_default_na=False,
+            na_values={"startTime": [""], "endTime": [""], "buffer": [""]},
         )
-        if result.returncode != 0:
-            raise RuntimeError(
-                "pydomino alignment subprocess failed "
-                f"with code {result.returncode}: {result.stderr or result.stdout}"
-            )
-        alignment = json.loads(output_path.read_text())
-    return [item for item in alignment if item[-1] != "pau"]
+        for record in df_retries[ALIGNMENT_RETRY_COLUMNS].to_dict("records"):
+            retry_records[record["IPUID"]] = record
+
+    return {
+        ipu_id: (signature, phoneme_rows[ipu_id], retry_records.get(ipu_id))
+        for ipu_id, signature in zip(df_state["IPUID"], df_state["signature"])
+        if phoneme_rows.get(ipu_id)
+    }
+
+
+def _joint_alignment_groups(jobs: list[tuple]) -> list[list[int]]:
+    """
+    Group consecutive jobs of one speaker that can be aligned in a single call.
+
+    Jobs join the previous group when nothing else starts between them, the
+    pause is at most ``JOINT_ALIGNMENT_MAX_GAP_S`` and the group stays within
+    ``JOINT_ALIGNMENT_MAX_SPAN_S``.
+    """
+    groups: list[list[int]] = []
+    for position, (ipu_row, _, _, _) in enumerate(jobs):
+        if groups:
+            first_row = jobs[groups[-1][0]][0]
+            last_row, _, _, last_next_boundary = jobs[groups[-1][-1]]
+            start = float(ipu_row["startTime"])
+            if (
+                ipu_row["speaker"] == last_row["speaker"]
+                and last_next_boundary >= start
+                and 0.0 <= start - float(last_row["endTime"]) <= JOINT_ALIGNMENT_MAX_GAP_S
+                and float(ipu_row["endTime"]) - float(first_row["startTime"]) <= JOINT_ALIGNMENT_MAX_SPAN_S
+            ):
+                groups[-1].append(position)
+                continue
+        groups.append([position])
+    return groups
+
+
+def _align_ipu_group(
+    worker_pool: AlignmentWorkerPool,
+    audio_source: AudioSource,
+    group_jobs: list[tuple],
+    iterations: int,
+    alignment_buffer_s: float,
+) -> list[list[list]] | None:
+    """
+    Align consecutive same-speaker IPUs in one aligner call.
+
+    The IPUs' phoneme sequences are joined with ``pau`` for the pauses
+    between them, and the result is split back using each IPU's phoneme
+    count. Returns the rows per IPU, or None when the call fails or the
+    counts do not add up.
+    """
+    first_row, _, previous_boundary, _ = group_jobs[0]
+    last_row, _, _, next_boundary = group_jobs[-1]
+    sample_rate = audio_source.sample_rate
+    attempt_start = max(float(first_row["startTime"]) - alignment_buffer_s, previous_boundary, 0.0)
+    attempt_end = min(float(last_row["endTime"]) + alignment_buffer_s, next_boundary, audio_source.duration)
+    start_sample = max(int(attempt_start * sample_rate), 0)
+    end_sample = min(int(attempt_end * sample_rate), len(audio_source))
+    if end_sample <= start_sample:
+        return None
+
+    phoneme_counts = [len(phoneme_sequence.split()) for _, phoneme_sequence, _, _ in group_jobs]
+    joint_sequence = " pau ".join(phoneme_sequence for _, phoneme_sequence, _, _ in group_jobs)
+    try:
+        phonemes = worker_pool.align(
+            audio_source.read(start_sample, end_sample), sample_rate, joint_sequence, iterations
+        )
+    except Exception as error:
+        print(f"joint alignment failed: {first_row['IPUID']}..{last_row['IPUID']} {error}")
+        return None
+    if len(phonemes) != sum(phoneme_counts):
+        print(
+            f"joint alignment failed: {first_row['IPUID']}..{last_row['IPUID']} "
+            f"expected {sum(phoneme_counts)} phonemes, got {len(phonemes)}"
+        )
+        return None
+
+    rows_per_ipu = []
+    offset = 0
+    for (ipu_row, _, _, _), count in zip(group_jobs, phoneme_counts):
+        rows_per_ipu.append(
+            [
+                [
+                    ipu_row["filename"],
+                    ipu_row["speaker"],
+                    ipu_row["IPUID"],
+                    round(float(start_time) + attempt_start, 4),
+                    round(float(end_time) + attempt_start, 4),
+                    phoneme,
+                ]
+                for start_time, end_time, phoneme in phonemes[offset:offset + count]
+            ]
+        )
+        offset += count
+    return rows_per_ipu
 
 
 def build_phoneme_alignment(
@@ -54,80 +458,202 @@ def build_phoneme_alignment(
     df_morph: pd.DataFrame,
     iterations: int = 3,
     alignment_buffer_s: float = 0.1,
+    worker_pool: AlignmentWorkerPool | None = None,
+    align_workers: int = 1,
+    speculative_retries: bool = False,
+    retry_records: list[dict] | None = None,
+    previous_alignment: dict[str, tuple[str, list[list], dict | None]] | None = None,
+    ipu_signatures: dict[str, str] | None = None,
+    joint_alignment: bool = False,
 ) -> pd.DataFrame:
-    source = Path(audio_path).expanduser().resolve()
-    audio, sample_rate = sf.read(source)
-    model_path = get_app_paths().phoneme_model_path
-    phoneme_sequences = (
-        df_morph.groupby("IPUID")["phonemes"].apply(lambda values: " ".join(values)).to_dict()
-    )
-    sorted_ipus = df_ipu.sort_values(["speaker", "startTime", "endTime"]).reset_index(drop=True)
+    """
+    Align every IPU's phoneme sequence against its audio slice.
+
+    IPUs are independent once their neighbouring boundaries are known, so
+    with ``align_workers`` > 1 they are aligned concurrently on that many
+    worker processes. Rows come back in the same order as a serial run.
+
+    With ``speculative_retries``, once an IPU fails with the default buffer
+    all wider buffers are aligned at once instead of one after another. This
+    hides the latency of retries; the extra worker processes are only
+    started when an IPU actually needs a retry. IPUs that needed a wider buffer or
+    failed are appended to ``retry_records`` when it is given.
+
+    IPUs whose signature matches ``previous_alignment`` (see
+    ``load_previous_alignment``) reuse their previous phoneme rows and retry
+    record instead of being realigned; IPUs that failed last time are always
+    realigned. The signature covers the IPU's text, timing, phoneme
+    sequence and neighbouring boundaries, so an edit also realigns the
+    neighbours whose available buffer it changed. In joint mode it covers
+    the whole group, so a group is reused or realigned as a unit. Signatures
+    of this run are written to ``ipu_signatures`` when it is given.
+
+    With ``joint_alignment``, back-to-back IPUs of one speaker are aligned in
+    a single call with ``pau`` between them (see ``_align_ipu_group``), which
+    saves the aligner's fixed cost on short utterances. A group whose joint
+    call fails is aligned IPU by IPU as usual.
+    """
+    if align_workers < 1:
+        raise ValueError("align_workers must be at least 1")
+    # The default buffer runs alone; only the wider ones after it run side by side.
+    retries_per_ipu = len(ALIGNMENT_BUFFER_MULTIPLIERS) + 1
+    if worker_pool is None:
+        pool_size = align_workers * retries_per_ipu if speculative_retries else align_workers
+        with AlignmentWorkerPool(get_app_paths().phoneme_model_path, size=pool_size) as pool:
+            return build_phoneme_alignment(
+                audio_path,
+                df_ipu,
+                df_morph,
+                iterations=iterations,
+                alignment_buffer_s=alignment_buffer_s,
+                worker_pool=pool,
+                align_workers=align_workers,
+                speculative_retries=speculative_retries,
+                retry_records=retry_records,
+                previous_alignment=previous_alignment,
+                ipu_signatures=ipu_signatures,
+                joint_alignment=joint_alignment,
+            )
 
-    rows = []
-    for _, ipu_row in sorted_ipus.iterrows():
-        if pd.isna(ipu_row["IPU"]):
-            continue
+    source = Path(audio_path).expanduser().resolve()
+    with open_audio(source) as audio_source:
+        audio_duration = audio_source.duration
+        phoneme_sequences = (
+            df_morph.groupby("IPUID")["phonemes"].apply(lambda values: " ".join(values)).to_dict()
+        )
+        sorted_ipus = df_ipu.sort_values(["speaker", "startTime", "endTime"]).reset_index(drop=True)
+
+        ipu_starts = np.maximum(sorted_ipus["startTime"].to_numpy(dtype=float), 0.0)
+        ipu_ends = np.minimum(sorted_ipus["endTime"].to_numpy(dtype=float), audio_duration)
+        previous_boundaries, next_boundaries = _neighbour_boundaries(
+            sorted_ipus["startTime"].to_numpy(dtype=float),
+            sorted_ipus["endTime"].to_numpy(dtype=float),
+            ipu_starts,
+            ipu_ends,
+            audio_duration,
+        )
 
-        ipu_id = ipu_row["IPUID"]
-        phoneme_sequence = phoneme_sequences.get(ipu_id, "").strip()
-        if not phoneme_sequence:
-            continue
+        candidates = []
+        for position, ipu_row in enumerate(sorted_ipus.to_dict("records")):
+            if pd.isna(ipu_row["IPU"]):
+                continue
 
-        ipu_start = max(float(ipu_row["startTime"]), 0.0)
-        ipu_end = min(float(ipu_row["endTime"]), len(audio) / sample_rate)
-        previous_ipus = sorted_ipus[sorted_ipus["endTime"] <= ipu_start]
-        next_ipus = sorted_ipus[sorted_ipus["startTime"] >= ipu_end]
-        previous_boundary = float(previous_ipus["endTime"].max()) if not previous_ipus.empty else 0.0
-        next_boundary = float(next_ipus["startTime"].min()) if not next_ipus.empty else len(audio) / sample_rate
-        max_left_buffer = max(ipu_start - previous_boundary, 0.0)
-        max_right_buffer = max(next_boundary - ipu_end, 0.0)
-        max_available_buffer = max(max_left_buffer, max_right_buffer, alignment_buffer_s)
-        buffer_attempts = [alignment_buffer_s]
-        for multiplier in [2.0, 4.0]:
-            buffer_attempts.append(alignment_buffer_s * multiplier)
-        buffer_attempts.append(max_available_buffer)
-        buffer_attempts = sorted({round(max(buffer, 0.0), 3) for buffer in buffer_attempts})
-
-        phonemes = None
-        alignment_start = ipu_start
-        for buffer_s in buffer_attempts:
-            attempt_start = max(ipu_start - buffer_s, previous_boundary, 0.0)
-            attempt_end = min(ipu_end + buffer_s, next_boundary, len(audio) / sample_rate)
-            start_sample = max(int(attempt_start * sample_rate), 0)
-            end_sample = min(int(attempt_end * sample_rate), len(audio))
-            if end_sample <= start_sample:
+            phoneme_sequence = phoneme_sequences.get(ipu_row["IPUID"], "").strip()
+            if not phoneme_sequence:
                 continue
 
-            try:
-                phonemes = _align_phoneme_sequence(
-                    audio[start_sample:end_sample],
-                    sample_rate,
+            candidates.append(
+                (ipu_row, phoneme_sequence, float(previous_boundaries[position]), float(next_boundaries[position]))
+            )
+
+        candidate_groups = (
+            _joint_alignment_groups(candidates)
+            if joint_alignment
+            else [[position] for position in range(len(candidates))]
+        )
+
+        # (rows, retry record) carried over from the previous run, per candidate.
+        reusable_results: list[tuple[list[list], dict | None] | None] = [None] * len(candidates)
+        if previous_alignment is not None or ipu_signatures is not None:
+            signatures = [
+                _ipu_signature(
+                    ipu_row,
                     phoneme_sequence,
+                    previous_boundary,
+                    next_boundary,
+                    alignment_buffer_s,
                     iterations,
-                    model_path,
+                    joint_alignment,
                 )
-                alignment_start = attempt_start
-                if buffer_s != alignment_buffer_s:
-                    print(f"alignment retry succeeded: {ipu_id} buffer={buffer_s:.3f}s")
-                break
-            except Exception as error:
-                print(f"alignment failed: {ipu_id} buffer={buffer_s:.3f}s {error}")
-
-        if phonemes is None:
-            continue
+                for ipu_row, phoneme_sequence, previous_boundary, next_boundary in candidates
+            ]
+            if joint_alignment:
+                # A jointly aligned IPU's rows depend on every member of its group,
+                # so an edit to one member invalidates the whole group.
+                for group in candidate_groups:
+                    group_signature = hashlib.sha1(
+                        "".join(signatures[position] for position in group).encode("utf-8")
+                    ).hexdigest()
+                    for position in group:
+                        signatures[position] = group_signature
+            for position, (ipu_row, _, _, _) in enumerate(candidates):
+                ipu_id = str(ipu_row["IPUID"])
+                if ipu_signatures is not None:
+                    ipu_signatures[ipu_id] = signatures[position]
+                previous = (previous_alignment or {}).get(ipu_id)
+                if previous is not None and previous[0] == signatures[position]:
+                    reusable_results[position] = previous[1:]
+
+        jobs = []
+        groups: list[list[int]] = []
+        ordered_results: list[tuple[list[list], dict | None] | int] = []
+        for group in candidate_groups:
+            if all(reusable_results[position] is not None for position in group):
+                ordered_results.extend(reusable_results[position] for position in group)
+                continue
+            groups.append(list(range(len(jobs), len(jobs) + len(group))))
+            ordered_results.extend(range(len(jobs), len(jobs) + len(group)))
+            jobs.extend(candidates[position] for position in group)
 
-        for start_time, end_time, phoneme in phonemes:
-            rows.append(
-                [
-                    ipu_row["filename"],
-                    ipu_row["speaker"],
-                    ipu_id,
-                    round(float(start_time) + alignment_start, 4),
-                    round(float(end_time) + alignment_start, 4),
-                    phoneme,
-                ]
+        if previous_alignment is not None:
+            print(f"alignment: realigning {len(jobs)} of {len(ordered_results)} IPUs")
+
+        retry_executor = (
+            ThreadPoolExecutor(max_workers=align_workers * retries_per_ipu) if speculative_retries else None
+        )
+
+        def align_job(job) -> tuple[list[list], dict | None]:
+            ipu_row, phoneme_sequence, previous_boundary, next_boundary = job
+            return _align_ipu(
+                worker_pool,
+                audio_source,
+                ipu_row,
+                phoneme_sequence,
+                iterations,
+                alignment_buffer_s,
+                previous_boundary,
+                next_boundary,
+                retry_executor=retry_executor,
             )
 
+        def align_group(group: list[int]) -> tuple[list[tuple[list[list], dict | None]], bool]:
+            group_jobs = [jobs[position] for position in group]
+            if len(group_jobs) == 1:
+                return [align_job(group_jobs[0])], False
+            rows_per_ipu = _align_ipu_group(worker_pool, audio_source, group_jobs, iterations, alignment_buffer_s)
+            if rows_per_ipu is not None:
+                return [(rows, None) for rows in rows_per_ipu], False
+            return [align_job(job) for job in group_jobs], True
+
+        try:
+            if align_workers > 1 and len(groups) > 1:
+                with ThreadPoolExecutor(max_workers=align_workers) as executor:
+                    group_results = list(executor.map(align_group, groups))
+            else:
+                group_results = [align_group(group) for group in groups]
+        finally:
+            if retry_executor is not None:
+                retry_executor.shutdown(wait=True, cancel_futures=True)
+    results = [result for results_for_group, _ in group_results for result in results_for_group]
+    if joint_alignment:
+        joint_groups = sum(len(group) > 1 for group in groups)
+        fallbacks = sum(fell_back for _, fell_back in group_results)
+        print(
+            f"joint alignment: {len(jobs)} IPUs in {len(groups)} calls, "
+            f"{fallbacks} of {joint_groups} joint groups fell back to per-IPU alignment"
+        )
+
+    ipu_retries = [record for _, record in results if record is not None]
+    if ipu_retries:
+        failed = sum(record["status"] == "failed" for record in ipu_retries)
+        print(f"alignment retries: {len(ipu_retries) - failed} retried, {failed} failed of {len(jobs)} IPUs")
+
+    ordered_results = [results[entry] if isinstance(entry, int) else entry for entry in ordered_results]
+    rows = [row for ipu_rows, _ in ordered_results for row in ipu_rows]
+    if retry_records is not None:
+        # Reused IPUs keep their earlier retry records, in the same order as a full run.
+        retry_records.extend(record for _, record in ordered_results if record is not None)
+
     df_phon = pd.DataFrame(
         rows,
         columns=["filename", "speaker", "IPUID", "startTime", "endTime", "phoneme"],
@@ -137,7 +663,7 @@ def build_phoneme_alignment(
             columns=["filename", "speaker", "tier", "IPUID", "phonemeID", "startTime", "endTime", "phoneme"]
         )
 
-    df_phon["timestamp"] = df_phon["startTime"].apply(float_to_timecode)
+    df_phon["timestamp"] = floats_to_timecodes(df_phon["startTime"])
     df_phon["phonemeID"] = df_phon["timestamp"].astype(str) + df_phon["speaker"].astype(str)
     df_phon["tier"] = "Phoneme_" + df_phon["speaker"].astype(str)
     return df_phon[
@@ -155,70 +681,139 @@ def _force_group_edges_to_ipu_boundaries(
         return df_items.copy()
 
     adjusted = df_items.copy()
-    ipu_boundaries = df_ipu.set_index("IPUID")[["startTime", "endTime"]].to_dict("index")
-
-    for ipu_id, group in adjusted.groupby("IPUID", sort=False):
-        boundaries = ipu_boundaries.get(ipu_id)
-        if boundaries is None:
-            continue
-
-        timed_group = group.dropna(subset=["startTime", "endTime"]).sort_values(["startTime", "endTime", id_column])
-        if timed_group.empty:
-            continue
-
-        first_index = timed_group.index[0]
-        last_index = timed_group.index[-1]
-        adjusted.loc[first_index, "startTime"] = float(boundaries["startTime"])
-        adjusted.loc[last_index, "endTime"] = float(boundaries["endTime"])
+    ipu_boundaries = df_ipu.set_index("IPUID")[["startTime", "endTime"]]
+
+    # A stable sort of the whole table orders every IPU's rows exactly as
+    # sorting each group separately would.
+    timed = adjusted.dropna(subset=["startTime", "endTime"])
+    timed = timed[timed["IPUID"].isin(ipu_boundaries.index)]
+    timed = timed.sort_values(["startTime", "endTime", id_column], kind="mergesort")
+    first_rows = timed.drop_duplicates("IPUID", keep="first")
+    last_rows = timed.drop_duplicates("IPUID", keep="last")
+    adjusted.loc[first_rows.index, "startTime"] = (
+        first_rows["IPUID"].map(ipu_boundaries["startTime"]).astype(float).to_numpy()
+    )
+    adjusted.loc[last_rows.index, "endTime"] = (
+        last_rows["IPUID"].map(ipu_boundaries["endTime"]).astype(float).to_numpy()
+    )
 
-    adjusted["timestamp"] = adjusted["startTime"].apply(float_to_timecode)
+    adjusted["timestamp"] = floats_to_timecodes(adjusted["startTime"])
     adjusted[id_column] = adjusted["timestamp"].astype(str) + adjusted["speaker"].astype(str)
     if "timestamp" not in df_items.columns:
         adjusted = adjusted.drop(columns=["timestamp"])
     return adjusted
 
 
-def build_word_alignment(df_morph: pd.DataFrame, df_phon: pd.DataFrame) -> pd.DataFrame:
-    rows = []
-    phoneme_groups = {
-        ipu_id: group.sort_values("startTime").reset_index(drop=True)
-        for ipu_id, group in df_phon.groupby("IPUID")
-    }
-
-    for ipu_id, morph_group in df_morph.groupby("IPUID"):
-        phoneme_group = phoneme_groups.get(ipu_id)
-        if phoneme_group is None or phoneme_group.empty:
-            continue
-
-        phoneme_list = [item.lower() for item in phoneme_group["phoneme"].tolist()]
-        start_times = phoneme_group["startTime"].tolist()
-        end_times = phoneme_group["endTime"].tolist()
-        phoneme_index = 0
-
-        for _, word_row in morph_group.sort_values("nth").iterrows():
-            word_phonemes = [item.lower() for item in str(word_row["phonemes"]).split() if item]
-            if not word_phonemes:
-                continue
-
-            word_start = None
-            word_end = None
-            match_index = 0
+def _match_phoneme_sequences(
+    phoneme_codes: np.ndarray,
+    phoneme_offsets: np.ndarray,
+    target_codes: np.ndarray,
+    target_offsets: np.ndarray,
+) -> np.ndarray:
+    """
+    Greedily match each IPU's target phonemes, in order, against its aligned phonemes.
+
+    Both code arrays hold every IPU back to back; ``*_offsets`` (length
+    ``n_ipus + 1``) mark where each IPU starts. For every target the
+    position of its matching phoneme in ``phoneme_codes`` is returned, or -1.
+    Each target matches the first equal phoneme after the previous match,
+    and once a target finds none, the rest of that IPU stays unmatched.
+    All IPUs advance together, one target per step.
+    """
+    matched = np.full(len(target_codes), -1, dtype=np.int64)
+    if len(phoneme_codes) == 0 or len(target_codes) == 0:
+        return matched
+
+    # Sorting (code, position) pairs turns "next phoneme with this code at or
+    # after the pointer" into a single searchsorted.
+    stride = np.int64(len(phoneme_codes) + 1)
+    sorted_keys = np.sort(phoneme_codes.astype(np.int64) * stride + np.arange(len(phoneme_codes), dtype=np.int64))
+
+    target_counts = np.diff(target_offsets)
+    active = np.flatnonzero(target_counts > 0)
+    pointers = phoneme_offsets[:-1].astype(np.int64).copy()
+    step = 0
+    while len(active):
+        targets = target_offsets[active] + step
+        code_base = target_codes[targets].astype(np.int64) * stride
+        found_at = np.searchsorted(sorted_keys, code_base + pointers[active])
+        keys = sorted_keys[np.minimum(found_at, len(sorted_keys) - 1)]
+        found = (found_at < len(sorted_keys)) & (keys < code_base + phoneme_offsets[active + 1])
+
+        positions = keys[found] - code_base[found]
+        matched[targets[found]] = positions
+        pointers[active[found]] = positions + 1
+
+        step += 1
+        active = active[found]
+        active = active[target_counts[active] > step]
+    return matched
 
-            while phoneme_index < len(phoneme_list) and match_index < len(word_phonemes):
-                if phoneme_list[phoneme_index] == word_phonemes[match_index]:
-                    if match_index == 0:
-                        word_start = start_times[phoneme_index]
-                    word_end = end_times[phoneme_index]
-                    match_index += 1
-                phoneme_index += 1
 
-            if word_start is None or word_end is None:
-                continue
-            rows.append([ipu_id, word_start, word_end, word_row["nth"]])
+def build_word_alignment(df_morph: pd.DataFrame, df_phon: pd.DataFrame) -> pd.DataFrame:
+    """
+    Time each morpheme from the aligned phonemes of its IPU.
+
+    Within an IPU, words are taken in ``nth`` order and their phonemes are
+    matched greedily, in sequence, against the IPU's phonemes sorted by
+    start time. A word spans its first to last matched phoneme. The whole
+    corpus is matched at once on integer phoneme codes.
+    """
+    phon = df_phon.dropna(subset=["IPUID"])
+    words = df_morph.dropna(subset=["IPUID"])
+    words = words[words["IPUID"].isin(phon["IPUID"])]
+
+    ipu_codes, ipu_ids = pd.factorize(phon["IPUID"], sort=True)
+    phon = phon.assign(_ipu=ipu_codes).sort_values(["_ipu", "startTime"], kind="stable")
+    words = words.assign(_ipu=ipu_ids.get_indexer(words["IPUID"])).sort_values(["_ipu", "nth"], kind="stable")
+
+    phoneme_tokens = phon["phoneme"].str.lower().to_numpy(dtype=object)
+    word_tokens = [str(value).lower().split() for value in words["phonemes"].tolist()]
+    token_counts = np.fromiter((len(tokens) for tokens in word_tokens), dtype=np.int64, count=len(word_tokens))
+    target_tokens = np.fromiter(
+        (token for tokens in word_tokens for token in tokens), dtype=object, count=int(token_counts.sum())
+    )
+    codes, _ = pd.factorize(np.concatenate([phoneme_tokens, target_tokens]))
+    phoneme_codes = codes[: len(phoneme_tokens)]
+    target_codes = codes[len(phoneme_tokens):]
+
+    n_ipus = len(ipu_ids)
+    phoneme_offsets = np.concatenate(([0], np.cumsum(np.bincount(phon["_ipu"].to_numpy(), minlength=n_ipus))))
+    word_ipus = words["_ipu"].to_numpy()
+    target_offsets = np.concatenate(
+        ([0], np.cumsum(np.bincount(word_ipus, weights=token_counts, minlength=n_ipus).astype(np.int64)))
+    )
+    matched = _match_phoneme_sequences(phoneme_codes, phoneme_offsets, target_codes, target_offsets)
+
+    # Matches form a prefix of every IPU's targets, so a word is timed iff its
+    # first phoneme matched, and its matched phonemes are a prefix of its own.
+    # Words between two timed words are untimed and add nothing to the sums.
+    word_first = np.cumsum(token_counts) - token_counts
+    timed = token_counts > 0
+    timed[timed] = matched[word_first[timed]] >= 0
+    matched_count = (
+        np.add.reduceat((matched >= 0).astype(np.int64), word_first[timed])
+        if timed.any()
+        else np.zeros(0, dtype=np.int64)
+    )
+    start_positions = matched[word_first[timed]]
+    end_positions = matched[word_first[timed] + matched_count - 1]
+
+    start_times = phon["startTime"].to_numpy()
+    end_times = phon["endTime"].to_numpy()
+    rows = [
+        list(row)
+        for row in zip(
+            words["IPUID"].to_numpy()[timed].tolist(),
+            start_times[start_positions].tolist(),
+            end_times[end_positions].tolist(),
+            words["nth"].to_numpy()[timed].tolist(),
+        )
+    ]
 
     df_word_timing = pd.DataFrame(rows, columns=["IPUID", "startTime", "endTime", "nth"])
     df_word = pd.merge(df_morph, df_word_timing, on=["IPUID", "nth"], how="left")
-    df_word["timestamp"] = df_word["startTime"].apply(float_to_timecode)
+    df_word["timestamp"] = floats_to_timecodes(df_word["startTime"])
     df_word["wordID"] = df_word["timestamp"].astype(str) + df_word["speaker"].astype(str)
     df_word["tier"] = "Word_" + df_word["speaker"].astype(str)
     return df_word[
@@ -274,13 +869,38 @@ def align_phonemes_and_words(
     output_dir: str | Path | None = None,
     iterations: int = 3,
     alignment_buffer_s: float = 0.1,
+    align_workers: int = 1,
+    speculative_retries: bool = False,
+    previous_dir: str | Path | None = None,
+    joint_alignment: bool = False,
 ) -> dict[str, pd.DataFrame | Path]:
+    """
+    Align phonemes and words and write the CSV outputs.
+
+    With ``previous_dir`` pointing at an earlier output directory (usually
+    ``output_dir`` itself), only IPUs that changed since that run are sent
+    to pydomino; word alignment is always recomputed.
+    """
     target_dir = Path(output_dir).expanduser().resolve() if output_dir else Path(audio_path).expanduser().resolve().parent
     target_dir.mkdir(parents=True, exist_ok=True)
 
+    retry_records: list[dict] = []
+    ipu_signatures: dict[str, str] = {}
+    previous_alignment = load_previous_alignment(previous_dir) if previous_dir is not None else None
     df_phon = build_phoneme_alignment(
-        audio_path, df_ipu, df_morph, iterations=iterations, alignment_buffer_s=alignment_buffer_s
+        audio_path,
+        df_ipu,
+        df_morph,
+        iterations=iterations,
+        alignment_buffer_s=alignment_buffer_s,
+        align_workers=align_workers,
+        speculative_retries=speculative_retries,
+        retry_records=retry_records,
+        previous_alignment=previous_alignment,
+        ipu_signatures=ipu_signatures,
+        joint_alignment=joint_alignment,
     )
+    df_aligned_rows = df_phon[ALIGNMENT_ROW_COLUMNS]
     df_phon = _force_group_edges_to_ipu_boundaries(df_phon, df_ipu, "phonemeID")
     df_word = build_word_alignment(df_morph[df_morph["orth"] != "¥"].copy(), df_phon)
     df_word = _force_group_edges_to_ipu_boundaries(df_word, df_ipu, "wordID")
@@ -295,6 +915,9 @@ def align_phonemes_and_words(
     word2ipu_csv = target_dir / "word2IPU.csv"
     phoneme2ipu_csv = target_dir / "phoneme2IPU.csv"
     ipu_csv = target_dir / "IPU.csv"
+    retries_csv = target_dir / ALIGNMENT_RETRIES_FILENAME
+    state_csv = target_dir / ALIGNMENT_STATE_FILENAME
+    rows_csv = target_dir / ALIGNMENT_ROWS_FILENAME
 
     df_phon_output = df_phon.drop(columns=["IPUID"], errors="ignore")
     df_word_output = df_word.drop(columns=["IPUID", "nth", "len"], errors="ignore")
@@ -304,6 +927,12 @@ def align_phonemes_and_words(
     df_word_to_ipu.to_csv(word2ipu_csv, encoding="utf-8_sig", index=False)
     df_phon_to_ipu.to_csv(phoneme2ipu_csv, encoding="utf-8_sig", index=False)
     df_ipu_output.to_csv(ipu_csv, encoding="utf-8_sig", index=False)
+    df_retries = pd.DataFrame(retry_records, columns=ALIGNMENT_RETRY_COLUMNS)
+    df_retries.to_csv(retries_csv, encoding="utf-8_sig", index=False)
+    pd.DataFrame(list(ipu_signatures.items()), columns=["IPUID", "signature"]).to_csv(
+        state_csv, encoding="utf-8_sig", index=False
+    )
+    df_aligned_rows.to_csv(rows_csv, encoding="utf-8_sig", index=False)
 
     return {
         "phoneme_csv": phoneme_csv,
@@ -311,9 +940,11 @@ def align_phonemes_and_words(
         "word2ipu_csv": word2ipu_csv,
         "phoneme2ipu_csv": phoneme2ipu_csv,
         "ipu_csv": ipu_csv,
+        "alignment_retries_csv": retries_csv,
         "phoneme_df": df_phon,
         "word_df": df_word,
         "word2ipu_df": df_word_to_ipu,
         "phoneme2ipu_df": df_phon_to_ipu,
         "ipu_df": df_ipu_output,
+        "alignment_retries_df": df_retries,
     }
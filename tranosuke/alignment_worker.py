@@ -1,15 +1,83 @@
 import json
+import os
 import sys
 from pathlib import Path
 
-import librosa
-import pydomino
-import soundfile as sf
+import numpy as np
+
+
+def _align(aligner, audio_segment, sample_rate: int, phoneme_sequence: str, iterations: int) -> list:
+    import librosa
+
+    if getattr(audio_segment, "ndim", 1) > 1:
+        audio_segment = audio_segment.mean(axis=1)
+    resampled = librosa.resample(audio_segment.astype("float32"), orig_sr=sample_rate, target_sr=16000)
+    return aligner.align(resampled, phoneme_sequence, int(iterations))
+
+
+def _read_exact(stream, size: int) -> bytes:
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            raise EOFError("request stream closed mid-message")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def serve(model_path: str) -> int:
+    """
+    Answer alignment requests on stdin until it is closed.
+
+    Each request is one JSON header line with ``phoneme_sequence``,
+    ``iterations``, ``sample_rate`` and ``num_samples``, followed by
+    ``num_samples`` mono float32 samples. Each reply is one JSON line with
+    either ``alignment`` or ``error``.
+    """
+    # Keep the protocol on a private descriptor so anything librosa or
+    # pydomino print to stdout, even while importing, ends up on stderr.
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    requests = sys.stdin.buffer
+
+    import pydomino
+
+    aligner = pydomino.Aligner(model_path)
+    while True:
+        header = requests.readline()
+        if not header:
+            return 0
+        request = json.loads(header)
+        payload = _read_exact(requests, int(request["num_samples"]) * 4)
+        audio_segment = np.frombuffer(payload, dtype=np.float32)
+        try:
+            reply = {
+                "alignment": _align(
+                    aligner,
+                    audio_segment,
+                    int(request["sample_rate"]),
+                    request["phoneme_sequence"],
+                    int(request["iterations"]),
+                )
+            }
+        except Exception as error:
+            reply = {"error": f"{type(error).__name__}: {error}"}
+        replies.write(json.dumps(reply).encode("utf-8") + b"\n")
+        replies.flush()
 
 
 def main() -> int:
+    if len(sys.argv) == 3 and sys.argv[1] == "--serve":
+        return serve(sys.argv[2])
+
     if len(sys.argv) != 4:
-        print("usage: alignment_worker.py request.json segment.wav output.json", file=sys.stderr)
+        print(
+            "usage: alignment_worker.py --serve model.onnx\n"
+            "       alignment_worker.py request.json segment.wav output.json",
+            file=sys.stderr,
+        )
         return 2
 
     request_path = Path(sys.argv[1])
@@ -17,13 +85,12 @@ def main() -> int:
     output_path = Path(sys.argv[3])
     request = json.loads(request_path.read_text())
 
-    audio_segment, sample_rate = sf.read(wav_path)
-    if getattr(audio_segment, "ndim", 1) > 1:
-        audio_segment = audio_segment.mean(axis=1)
-    resampled = librosa.resample(audio_segment.astype("float32"), orig_sr=sample_rate, target_sr=16000)
+    import pydomino
+    import soundfile as sf
 
+    audio_segment, sample_rate = sf.read(wav_path)
     aligner = pydomino.Aligner(str(request["model_path"]))
-    alignment = aligner.align(resampled, request["phoneme_sequence"], int(request["iterations"]))
+    alignment = _align(aligner, audio_segment, sample_rate, request["phoneme_sequence"], request["iterations"])
     output_path.write_text(json.dumps(alignment))
     return 0
 
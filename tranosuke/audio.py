@@ -0,0 +1,159 @@
+import struct
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# (format tag, bits per sample) -> (sample dtype, scale to [-1, 1))
+_MEMMAP_FORMATS = {
+    (WAVE_FORMAT_PCM, 16): (np.dtype("<i2"), 1.0 / 0x8000),
+    (WAVE_FORMAT_PCM, 32): (np.dtype("<i4"), 1.0 / 0x80000000),
+    (WAVE_FORMAT_IEEE_FLOAT, 32): (np.dtype("<f4"), None),
+    (WAVE_FORMAT_IEEE_FLOAT, 64): (np.dtype("<f8"), None),
+}
+
+
+class AudioSource(ABC):
+    """
+    Random access to an audio file as mono float32 samples.
+
+    Spans are read on demand, so callers can slice long recordings without
+    holding the whole file in memory. Use ``open_audio`` to get one.
+    """
+
+    def __init__(self, path: Path, sample_rate: int, num_samples: int, channels: int) -> None:
+        self.path = path
+        self.sample_rate = sample_rate
+        self.num_samples = num_samples
+        self.channels = channels
+
+    def __len__(self) -> int:
+        return self.num_samples
+
+    @property
+    def duration(self) -> float:
+        return self.num_samples / self.sample_rate
+
+    @abstractmethod
+    def read(self, start_sample: int = 0, end_sample: int | None = None) -> np.ndarray:
+        """Return samples ``[start_sample, end_sample)`` downmixed to mono float32."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "AudioSource":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _clamp(self, start_sample: int, end_sample: int | None) -> tuple[int, int]:
+        end = self.num_samples if end_sample is None else min(int(end_sample), self.num_samples)
+        start = min(max(int(start_sample), 0), end) if end > 0 else 0
+        return start, max(end, start)
+
+
+class _MemmapWavSource(AudioSource):
+    """PCM or float WAV whose ``data`` chunk is memory-mapped."""
+
+    def __init__(
+        self,
+        path: Path,
+        sample_rate: int,
+        channels: int,
+        dtype: np.dtype,
+        scale: float | None,
+        offset: int,
+        num_samples: int,
+    ) -> None:
+        super().__init__(path, sample_rate, num_samples, channels)
+        self._scale = scale
+        self._samples = (
+            np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(num_samples, channels))
+            if num_samples
+            else np.zeros((0, channels), dtype=dtype)
+        )
+
+    def read(self, start_sample: int = 0, end_sample: int | None = None) -> np.ndarray:
+        start, end = self._clamp(start_sample, end_sample)
+        frames = self._samples[start:end]
+        audio = frames.astype(np.float32)
+        if self._scale is not None:
+            audio *= np.float32(self._scale)
+        return audio.mean(axis=1) if self.channels > 1 else audio[:, 0]
+
+    def close(self) -> None:
+        self._samples = None
+
+
+class _SoundFileSource(AudioSource):
+    """Fallback for formats that cannot be mapped directly; reads each span through soundfile."""
+
+    def read(self, start_sample: int = 0, end_sample: int | None = None) -> np.ndarray:
+        start, end = self._clamp(start_sample, end_sample)
+        audio, _ = sf.read(str(self.path), start=start, stop=end, dtype="float32", always_2d=True)
+        return audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+
+
+def _parse_wav_header(path: Path) -> tuple[int, int, np.dtype, float | None, int, int] | None:
+    """Return (sample rate, channels, dtype, scale, data offset, frames) for mappable WAVs, else None."""
+    file_size = path.stat().st_size
+    with path.open("rb") as handle:
+        header = handle.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+
+        fmt = None
+        position = 12
+        while position + 8 <= file_size:
+            handle.seek(position)
+            chunk_id, chunk_size = struct.unpack("<4sI", handle.read(8))
+            body = position + 8
+            if chunk_id == b"fmt ":
+                raw = handle.read(min(chunk_size, 40))
+                if len(raw) < 16:
+                    return None
+                format_tag, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", raw[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and len(raw) >= 26:
+                    format_tag = struct.unpack("<H", raw[24:26])[0]
+                fmt = (format_tag, channels, sample_rate, block_align, bits)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    return None
+                format_tag, channels, sample_rate, block_align, bits = fmt
+                layout = _MEMMAP_FORMATS.get((format_tag, bits))
+                if layout is None or channels < 1 or block_align != channels * bits // 8:
+                    return None
+                # Streaming writers may leave the size as 0 or 0xFFFFFFFF.
+                data_size = chunk_size
+                if data_size in (0, 0xFFFFFFFF) or body + data_size > file_size:
+                    data_size = file_size - body
+                dtype, scale = layout
+                return sample_rate, channels, dtype, scale, body, data_size // block_align
+            position = body + chunk_size + (chunk_size & 1)
+    return None
+
+
+def open_audio(path: str | Path) -> AudioSource:
+    """
+    Open an audio file for span-wise reading.
+
+    16/32-bit PCM and float WAV files, such as those written by
+    ``convert_media_to_wavs``, are memory-mapped, so reading a span neither
+    loads nor copies the rest of the file. Anything else is read through
+    soundfile one span at a time.
+    """
+    source = Path(path).expanduser().resolve()
+    layout = _parse_wav_header(source) if source.suffix.lower() == ".wav" else None
+    if layout is not None:
+        sample_rate, channels, dtype, scale, offset, num_samples = layout
+        return _MemmapWavSource(source, sample_rate, channels, dtype, scale, offset, num_samples)
+
+    info = sf.info(str(source))
+    return _SoundFileSource(source, int(info.samplerate), int(info.frames), int(info.channels))
@@ -0,0 +1,245 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+from tranosuke.config import get_app_paths, read_user_config
+
+
+DEFAULT_TRANSCRIPTION_CACHE_MAX_ENTRIES = 200_000
+DEFAULT_READING_CACHE_MAX_ENTRIES = 100_000
+
+
+class TranscriptionCache:
+    """
+    Persistent LRU map from chunk keys to Whisper text, stored in SQLite.
+
+    Entries beyond ``max_entries`` are dropped least recently used first.
+    """
+
+    def __init__(self, path: str | Path, max_entries: int = DEFAULT_TRANSCRIPTION_CACHE_MAX_ENTRIES) -> None:
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS chunks (key TEXT PRIMARY KEY, text TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS chunks_last_used ON chunks (last_used)")
+        self._connection.commit()
+
+    def get_many(self, keys: list[str]) -> dict[str, str]:
+        """Return cached texts for the keys that are present and mark them as used."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                row = self._connection.execute("SELECT text FROM chunks WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    found[key] = row[0]
+            now = time.time()
+            self._connection.executemany(
+                "UPDATE chunks SET last_used = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+            self._connection.commit()
+        return found
+
+    def put_many(self, items: dict[str, str]) -> None:
+        if not items:
+            return
+        with self._lock:
+            now = time.time()
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO chunks (key, text, last_used) VALUES (?, ?, ?)",
+                [(key, text, now) for key, text in items.items()],
+            )
+            self._trim()
+            self._connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM chunks")
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._connection.execute("SELECT COUNT(*) FROM chunks").fetchone()[0])
+
+    def _trim(self) -> None:
+        count = int(self._connection.execute("SELECT COUNT(*) FROM chunks").fetchone()[0])
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        self._connection.execute(
+            "DELETE FROM chunks WHERE key IN (SELECT key FROM chunks ORDER BY last_used ASC LIMIT ?)",
+            (excess,),
+        )
+
+
+_TRANSCRIPTION_CACHE: TranscriptionCache | None = None
+_TRANSCRIPTION_CACHE_LOCK = threading.Lock()
+
+
+def get_transcription_cache() -> TranscriptionCache:
+    """Return the process-wide cache, sized by TRANSCRIPTION_CACHE_MAX_ENTRIES in config.yaml."""
+    global _TRANSCRIPTION_CACHE
+    with _TRANSCRIPTION_CACHE_LOCK:
+        if _TRANSCRIPTION_CACHE is None:
+            max_entries = read_user_config().get("TRANSCRIPTION_CACHE_MAX_ENTRIES")
+            _TRANSCRIPTION_CACHE = TranscriptionCache(
+                get_app_paths().transcription_cache_path,
+                max_entries=int(max_entries) if max_entries else DEFAULT_TRANSCRIPTION_CACHE_MAX_ENTRIES,
+            )
+        return _TRANSCRIPTION_CACHE
+
+
+class ReadingCache:
+    """
+    Bounded in-memory LRU for the kana and phoneme conversions done during
+    morphological analysis, keyed by (kind, text).
+
+    Entries can be loaded from and saved to a SQLite file so later runs
+    start warm. ``hits`` and ``misses`` count lookups since creation.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_READING_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._touched: set[tuple[str, str]] = set()
+        self._loaded_paths: set[Path] = set()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, kind: str, text: str, compute: Callable[[str], str]) -> str:
+        key = (kind, text)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._touched.add(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = compute(text)
+        with self._lock:
+            self._entries[key] = value
+            self._touched.add(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._touched.discard(evicted)
+        return value
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def load(self, path: str | Path) -> None:
+        """Merge the most recently used entries saved at ``path``; later calls for the same path do nothing."""
+        source = Path(path)
+        with self._lock:
+            if source in self._loaded_paths:
+                return
+            self._loaded_paths.add(source)
+        if not source.exists():
+            return
+        connection = _connect_reading_store(source)
+        try:
+            rows = connection.execute(
+                "SELECT kind, key, value FROM readings ORDER BY last_used DESC LIMIT ?",
+                (self.max_entries,),
+            ).fetchall()
+        finally:
+            connection.close()
+        with self._lock:
+            for kind, text, value in reversed(rows):
+                key = (kind, text)
+                if key not in self._entries:
+                    self._entries[key] = value
+                    self._entries.move_to_end(key, last=False)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def take_updates(self) -> list[tuple[str, str, str]]:
+        """Return (kind, text, value) for entries used since the last call or save, and reset that set."""
+        with self._lock:
+            items = [(kind, text, self._entries[(kind, text)]) for kind, text in self._touched]
+            self._touched.clear()
+        return items
+
+    def merge(self, items: list[tuple[str, str, str]]) -> None:
+        """Add entries produced elsewhere, such as in a worker process, as most recently used."""
+        with self._lock:
+            for kind, text, value in items:
+                key = (kind, text)
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                self._touched.add(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._touched.discard(evicted)
+
+    def save(self, path: str | Path) -> None:
+        """Write entries used since the last save to ``path``, keeping at most ``max_entries`` rows there."""
+        items = self.take_updates()
+        if not items:
+            return
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        connection = _connect_reading_store(target)
+        try:
+            now = time.time()
+            connection.executemany(
+                "INSERT OR REPLACE INTO readings (kind, key, value, last_used) VALUES (?, ?, ?, ?)",
+                [(kind, text, value, now) for kind, text, value in items],
+            )
+            connection.execute(
+                "DELETE FROM readings WHERE rowid IN "
+                "(SELECT rowid FROM readings ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            connection.commit()
+        finally:
+            connection.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._touched.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def _connect_reading_store(path: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(str(path))
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS readings "
+        "(kind TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, last_used REAL NOT NULL, "
+        "PRIMARY KEY (kind, key))"
+    )
+    return connection
+
+
+_READING_CACHE: ReadingCache | None = None
+_READING_CACHE_LOCK = threading.Lock()
+
+
+def get_reading_cache() -> ReadingCache:
+    """Return the process-wide reading cache, sized by READING_CACHE_MAX_ENTRIES in config.yaml."""
+    global _READING_CACHE
+    with _READING_CACHE_LOCK:
+        if _READING_CACHE is None:
+            max_entries = read_user_config().get("READING_CACHE_MAX_ENTRIES")
+            _READING_CACHE = ReadingCache(
+                max_entries=int(max_entries) if max_entries else DEFAULT_READING_CACHE_MAX_ENTRIES,
+            )
+        return _READING_CACHE
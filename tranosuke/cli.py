@@ -2,14 +2,8 @@ import argparse
 from pathlib import Path
 import sys
 
-from tranosuke.alignment import align_phonemes_and_words
 from tranosuke.config import initialize_app, save_huggingface_token
-from tranosuke.corpus import build_corpus
-from tranosuke.denoise import denoise_media
-from tranosuke.luu import build_luus_from_word_csv
-from tranosuke.media import convert_media_to_wavs
-from tranosuke.morphology import analyze_ipu_csv
-from tranosuke.transcription import transcribe_media_to_ipu_csv
+from tranosuke.profiles import PERFORMANCE_PROFILES
 
 
 def _console_progress(value: float, message: str) -> None:
@@ -50,10 +44,27 @@ def build_parser() -> argparse.ArgumentParser:
     transcribe_parser.add_argument("--segment-buffer", type=float, default=0.1)
     transcribe_parser.add_argument("--device", choices=["cpu", "cuda"], default=None)
     transcribe_parser.add_argument("--device-index", type=int, default=None)
+    transcribe_parser.add_argument("--batch-size", type=int, default=1)
+    transcribe_parser.add_argument("--device-indices", type=int, nargs="+", default=None)
+    transcribe_parser.add_argument("--long-form-window", type=float, default=None)
+    transcribe_parser.add_argument("--long-form-overlap", type=float, default=30.0)
+    transcribe_parser.add_argument("--channel-speakers", action="store_true")
+    transcribe_parser.add_argument("--profile", choices=list(PERFORMANCE_PROFILES), default=None)
+    transcribe_parser.add_argument("--cpu-threads", type=int, default=None)
+    transcribe_parser.add_argument("--num-workers", type=int, default=None)
+    transcribe_parser.add_argument("--no-diarization-cache", action="store_true")
+    transcribe_parser.add_argument("--no-transcription-cache", action="store_true")
 
     morph_parser = subparsers.add_parser("morph")
     morph_parser.add_argument("input_csv")
     morph_parser.add_argument("--output-csv")
+    morph_parser.add_argument("--persist-reading-cache", action="store_true")
+    morph_parser.add_argument("--legacy-phonemes", action="store_true")
+    morph_parser.add_argument("--workers", type=int, default=1)
+
+    phoneme_diff_parser = subparsers.add_parser("phoneme-diff")
+    phoneme_diff_parser.add_argument("input_csv")
+    phoneme_diff_parser.add_argument("--output-csv")
 
     align_parser = subparsers.add_parser("align")
     align_parser.add_argument("audio_path")
@@ -61,6 +72,10 @@ def build_parser() -> argparse.ArgumentParser:
     align_parser.add_argument("morpheme_csv")
     align_parser.add_argument("--output-dir")
     align_parser.add_argument("--alignment-buffer", type=float, default=0.1)
+    align_parser.add_argument("--align-workers", type=int, default=1)
+    align_parser.add_argument("--speculative-retries", action="store_true")
+    align_parser.add_argument("--previous-dir", default=None)
+    align_parser.add_argument("--joint-alignment", action="store_true")
 
     luu_parser = subparsers.add_parser("luu")
     luu_parser.add_argument("word_csv")
@@ -75,8 +90,29 @@ def build_parser() -> argparse.ArgumentParser:
     corpus_parser.add_argument("--segment-buffer", type=float, default=0.1)
     corpus_parser.add_argument("--device", choices=["cpu", "cuda"], default=None)
     corpus_parser.add_argument("--device-index", type=int, default=None)
+    corpus_parser.add_argument("--batch-size", type=int, default=1)
+    corpus_parser.add_argument("--device-indices", type=int, nargs="+", default=None)
+    corpus_parser.add_argument("--long-form-window", type=float, default=None)
+    corpus_parser.add_argument("--long-form-overlap", type=float, default=30.0)
+    corpus_parser.add_argument("--channel-speakers", action="store_true")
+    corpus_parser.add_argument("--profile", choices=list(PERFORMANCE_PROFILES), default=None)
+    corpus_parser.add_argument("--cpu-threads", type=int, default=None)
+    corpus_parser.add_argument("--num-workers", type=int, default=None)
+    corpus_parser.add_argument("--no-diarization-cache", action="store_true")
+    corpus_parser.add_argument("--no-transcription-cache", action="store_true")
+    corpus_parser.add_argument("--align-workers", type=int, default=1)
+    corpus_parser.add_argument("--speculative-retries", action="store_true")
+    corpus_parser.add_argument("--joint-alignment", action="store_true")
+    corpus_parser.add_argument("--persist-reading-cache", action="store_true")
+    corpus_parser.add_argument("--legacy-phonemes", action="store_true")
     corpus_parser.add_argument("--denoise", action="store_true")
 
+    autotune_parser = subparsers.add_parser("autotune")
+    autotune_parser.add_argument("--audio-path", default=None)
+    autotune_parser.add_argument("--model-name", default="turbo")
+    autotune_parser.add_argument("--beam-size", type=int, default=5)
+    autotune_parser.add_argument("--device-index", type=int, default=None)
+
     subparsers.add_parser("gui")
     return parser
 
@@ -85,7 +121,7 @@ def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
-    if args.command in {"morph", "align", "luu", "corpus", "gui"}:
+    if args.command in {"morph", "phoneme-diff", "align", "luu", "corpus", "gui"}:
         initialize_app(include_denoise=args.command == "corpus" and getattr(args, "denoise", False))
 
     if args.command == "init":
@@ -98,7 +134,11 @@ def main(argv: list[str] | None = None) -> int:
         print("saved")
         return 0
 
+    # Each command imports its own dependencies so light commands do not
+    # pay for Whisper, pyannote, torch or MeCab at startup.
     if args.command == "convert":
+        from tranosuke.media import convert_media_to_wavs
+
         result = convert_media_to_wavs(
             args.input_path,
             output_dir=args.output_dir,
@@ -110,11 +150,15 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.command == "denoise":
+        from tranosuke.denoise import denoise_media
+
         initialize_app(include_denoise=True)
         print(denoise_media(args.input_path, output_dir=args.output_dir))
         return 0
 
     if args.command == "transcribe":
+        from tranosuke.transcription import transcribe_media_to_ipu_csv
+
         csv_path, _ = transcribe_media_to_ipu_csv(
             args.input_path,
             output_dir=args.output_dir,
@@ -125,18 +169,45 @@ def main(argv: list[str] | None = None) -> int:
             device_index=args.device_index,
             segment_buffer_s=args.segment_buffer,
             progress_callback=_console_progress,
+            batch_size=args.batch_size,
+            device_indices=args.device_indices,
+            long_form_window_s=args.long_form_window,
+            long_form_overlap_s=args.long_form_overlap,
+            channel_speakers=args.channel_speakers,
+            profile=args.profile,
+            cpu_threads=args.cpu_threads,
+            num_workers=args.num_workers,
+            use_diarization_cache=not args.no_diarization_cache,
+            use_transcription_cache=not args.no_transcription_cache,
         )
         print(csv_path)
         return 0
 
     if args.command == "morph":
-        csv_path, _ = analyze_ipu_csv(args.input_csv, output_csv_path=args.output_csv)
+        from tranosuke.morphology import analyze_ipu_csv
+
+        csv_path, _ = analyze_ipu_csv(
+            args.input_csv,
+            output_csv_path=args.output_csv,
+            persist_reading_cache=args.persist_reading_cache,
+            legacy_phonemes=args.legacy_phonemes,
+            workers=args.workers,
+        )
+        print(csv_path)
+        return 0
+
+    if args.command == "phoneme-diff":
+        from tranosuke.morphology import compare_phoneme_converters_csv
+
+        csv_path, _ = compare_phoneme_converters_csv(args.input_csv, output_csv_path=args.output_csv)
         print(csv_path)
         return 0
 
     if args.command == "align":
         import pandas as pd
 
+        from tranosuke.alignment import align_phonemes_and_words
+
         df_ipu = pd.read_csv(args.ipu_csv)
         df_morph = pd.read_csv(args.morpheme_csv)
         result = align_phonemes_and_words(
@@ -145,21 +216,30 @@ def main(argv: list[str] | None = None) -> int:
             df_morph,
             output_dir=args.output_dir,
             alignment_buffer_s=args.alignment_buffer,
+            align_workers=args.align_workers,
+            speculative_retries=args.speculative_retries,
+            previous_dir=args.previous_dir,
+            joint_alignment=args.joint_alignment,
         )
         print(result["phoneme_csv"])
         print(result["word_csv"])
         print(result["word2ipu_csv"])
         print(result["phoneme2ipu_csv"])
         print(result["ipu_csv"])
+        print(result["alignment_retries_csv"])
         return 0
 
     if args.command == "luu":
+        from tranosuke.luu import build_luus_from_word_csv
+
         result = build_luus_from_word_csv(args.word_csv, output_dir=args.output_dir)
         print(result["luu_csv"])
         print(result["word2luu_csv"])
         return 0
 
     if args.command == "corpus":
+        from tranosuke.corpus import build_corpus
+
         result = build_corpus(
             args.input_path,
             output_dir=args.output_dir,
@@ -171,6 +251,21 @@ def main(argv: list[str] | None = None) -> int:
             device_index=args.device_index,
             segment_buffer_s=args.segment_buffer,
             progress_callback=_console_progress,
+            batch_size=args.batch_size,
+            device_indices=args.device_indices,
+            long_form_window_s=args.long_form_window,
+            long_form_overlap_s=args.long_form_overlap,
+            channel_speakers=args.channel_speakers,
+            profile=args.profile,
+            cpu_threads=args.cpu_threads,
+            num_workers=args.num_workers,
+            use_diarization_cache=not args.no_diarization_cache,
+            use_transcription_cache=not args.no_transcription_cache,
+            align_workers=args.align_workers,
+            speculative_retries=args.speculative_retries,
+            joint_alignment=args.joint_alignment,
+            persist_reading_cache=args.persist_reading_cache,
+            legacy_phonemes=args.legacy_phonemes,
         )
         print(result.ipu_csv)
         print(result.morpheme_csv)
@@ -178,6 +273,21 @@ def main(argv: list[str] | None = None) -> int:
         print(result.word2ipu_csv)
         print(result.phoneme2ipu_csv)
         print(result.phoneme_csv)
+        print(result.alignment_retries_csv)
+        return 0
+
+    if args.command == "autotune":
+        from tranosuke.transcription import autotune_performance_profile
+
+        best, timings = autotune_performance_profile(
+            args.audio_path,
+            model_name=args.model_name,
+            beam_size=args.beam_size,
+            device_index=args.device_index,
+        )
+        for name, seconds in sorted(timings.items(), key=lambda item: item[1]):
+            print(f"{name}\t{seconds:.2f}s")
+        print(f"saved: {best}")
         return 0
 
     if args.command == "gui":
@@ -1,3 +1,4 @@
+import functools
 import os
 import platform
 import shutil
@@ -7,8 +8,6 @@ from pathlib import Path
 
 import yaml
 
-from tranosuke.utils import download_and_extract, download_file, download_json
-
 
 UNIDIC_CSJ_URL = "https://clrd.ninjal.ac.jp/unidic_archive/2302/unidic-csj-202302.zip"
 PYDOMINO_MODEL_URL = (
@@ -29,13 +28,25 @@ class AppPaths:
     phoneme_model_path: Path
     deepfilter_dir: Path
     deepfilter_binary_path: Path
+    diarization_cache_dir: Path
+    transcription_cache_path: Path
+    reading_cache_path: Path
     system: str
     machine: str
-    device: str
+
+    @property
+    def device(self) -> str:
+        """Best available Torch device, detected on first access."""
+        return detect_device()
 
 
+@functools.cache
 def detect_device() -> str:
-    """Return the best available Torch device without importing Torch at module load time."""
+    """
+    Return the best available Torch device without importing Torch at module load time.
+
+    The result is cached for the life of the process.
+    """
     try:
         import torch
     except ModuleNotFoundError:
@@ -92,8 +103,13 @@ def get_base_dir() -> Path:
 
 
 def get_app_paths() -> AppPaths:
-    base_dir = get_base_dir()
-    cache_dir = Path.home() / ".tranosuke"
+    """Return the application paths, cached per home and base directory."""
+    return _build_app_paths(Path.home(), get_base_dir())
+
+
+@functools.cache
+def _build_app_paths(home: Path, base_dir: Path) -> AppPaths:
+    cache_dir = home / ".tranosuke"
     runtime_dir = cache_dir / "runtime"
     models_dir = cache_dir / "models"
     tools_dir = runtime_dir / "tools"
@@ -112,9 +128,11 @@ def get_app_paths() -> AppPaths:
         phoneme_model_path=models_dir / "phoneme_transition_model.onnx",
         deepfilter_dir=tools_dir / "deepfilternet",
         deepfilter_binary_path=tools_dir / "deepfilternet" / deepfilter_binary,
+        diarization_cache_dir=cache_dir / "cache" / "diarization",
+        transcription_cache_path=cache_dir / "cache" / "transcription.sqlite3",
+        reading_cache_path=cache_dir / "cache" / "readings.sqlite3",
         system=system,
         machine=machine,
-        device=detect_device(),
     )
 
 
@@ -131,10 +149,14 @@ def _ensure_config_file(paths: AppPaths) -> None:
 
 
 def _ensure_unidic(paths: AppPaths) -> None:
+    from tranosuke.utils import download_and_extract
+
     download_and_extract(UNIDIC_CSJ_URL, paths.unidic_dir)
 
 
 def _ensure_phoneme_model(paths: AppPaths) -> None:
+    from tranosuke.utils import download_file
+
     download_file(PYDOMINO_MODEL_URL, paths.phoneme_model_path)
 
 
@@ -228,6 +250,8 @@ def ensure_denoise_runtime() -> AppPaths:
         except FileNotFoundError:
             pass
 
+    from tranosuke.utils import download_and_extract, download_json
+
     release_data = download_json(DEEPFILTERNET_RELEASES_API)
     asset = _select_deepfilter_asset(paths, release_data)
     archive_name = asset["name"]
@@ -6,7 +6,7 @@ from tranosuke.alignment import align_phonemes_and_words
 from tranosuke.denoise import denoise_media
 from tranosuke.media import MediaConversionResult, convert_media_to_wavs
 from tranosuke.morphology import analyze_ipus
-from tranosuke.transcription import transcribe_ipus
+from tranosuke.transcription import transcribe_channel_ipus, transcribe_ipus
 
 
 ProgressCallback = Callable[[float, str], None]
@@ -28,6 +28,7 @@ class CorpusBuildResult:
     word2ipu_csv: Path
     phoneme2ipu_csv: Path
     phoneme_csv: Path
+    alignment_retries_csv: Path
 
 
 def build_corpus(
@@ -41,35 +42,89 @@ def build_corpus(
     device_index: int | None = None,
     segment_buffer_s: float = 0.1,
     progress_callback: ProgressCallback | None = None,
+    batch_size: int = 1,
+    device_indices: list[int] | None = None,
+    profile: str | None = None,
+    cpu_threads: int | None = None,
+    num_workers: int | None = None,
+    use_transcription_cache: bool = True,
+    long_form_window_s: float | None = None,
+    long_form_overlap_s: float = 30.0,
+    channel_speakers: bool = False,
+    use_diarization_cache: bool = True,
+    align_workers: int = 1,
+    speculative_retries: bool = False,
+    joint_alignment: bool = False,
+    persist_reading_cache: bool = False,
+    legacy_phonemes: bool = False,
 ) -> CorpusBuildResult:
     """
     Run the end-to-end corpus pipeline from media input to CSV outputs.
+
+    With ``channel_speakers`` and a multi-channel input, each channel is
+    transcribed as its own speaker and diarization is skipped. Alignment
+    still uses the mixed mono wav.
     """
     _report_progress(progress_callback, 0.0, "wavへ変換しています")
     media_result = convert_media_to_wavs(input_path, output_dir=output_dir, split_channels=True)
     working_wav = media_result.mixed_mono_wav
 
+    channel_wavs = media_result.channel_wavs if channel_speakers else []
+
     if use_denoise:
         _report_progress(progress_callback, 0.08, "ノイズ低減を実行しています")
         working_wav = denoise_media(working_wav)
+        channel_wavs = [denoise_media(channel_wav) for channel_wav in channel_wavs]
 
     transcribe_start = 0.15 if use_denoise else 0.08
 
     def transcribe_progress(value: float, message: str) -> None:
         _report_progress(progress_callback, transcribe_start + (0.62 - transcribe_start) * value, message)
 
-    df_ipu = transcribe_ipus(
-        working_wav,
-        model_name=model_name,
-        beam_size=beam_size,
-        pause_threshold_ms=pause_threshold_ms,
-        device=device,
-        device_index=device_index,
-        segment_buffer_s=segment_buffer_s,
-        progress_callback=transcribe_progress,
-    )
+    if channel_wavs:
+        df_ipu = transcribe_channel_ipus(
+            channel_wavs,
+            filename=Path(working_wav).stem,
+            model_name=model_name,
+            beam_size=beam_size,
+            pause_threshold_ms=pause_threshold_ms,
+            device=device,
+            device_index=device_index,
+            segment_buffer_s=segment_buffer_s,
+            progress_callback=transcribe_progress,
+            batch_size=batch_size,
+            device_indices=device_indices,
+            profile=profile,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+            use_transcription_cache=use_transcription_cache,
+        )
+    else:
+        df_ipu = transcribe_ipus(
+            working_wav,
+            model_name=model_name,
+            beam_size=beam_size,
+            pause_threshold_ms=pause_threshold_ms,
+            device=device,
+            device_index=device_index,
+            segment_buffer_s=segment_buffer_s,
+            progress_callback=transcribe_progress,
+            batch_size=batch_size,
+            device_indices=device_indices,
+            profile=profile,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+            use_transcription_cache=use_transcription_cache,
+            long_form_window_s=long_form_window_s,
+            long_form_overlap_s=long_form_overlap_s,
+            use_diarization_cache=use_diarization_cache,
+        )
     _report_progress(progress_callback, 0.68, "形態素解析を実行しています")
-    df_morph = analyze_ipus(df_ipu)
+    df_morph = analyze_ipus(
+        df_ipu,
+        persist_reading_cache=persist_reading_cache,
+        legacy_phonemes=legacy_phonemes,
+    )
 
     target_dir = media_result.mixed_mono_wav.parent
     morpheme_csv = target_dir / "morpheme.csv"
@@ -77,7 +132,14 @@ def build_corpus(
 
     _report_progress(progress_callback, 0.76, "音素・単語アラインメントを実行しています")
     alignment_result = align_phonemes_and_words(
-        working_wav, df_ipu, df_morph, output_dir=target_dir, alignment_buffer_s=segment_buffer_s
+        working_wav,
+        df_ipu,
+        df_morph,
+        output_dir=target_dir,
+        alignment_buffer_s=segment_buffer_s,
+        align_workers=align_workers,
+        speculative_retries=speculative_retries,
+        joint_alignment=joint_alignment,
     )
     _report_progress(progress_callback, 1.0, "コーパス作成が完了しました")
 
@@ -90,4 +152,5 @@ def build_corpus(
         word2ipu_csv=Path(alignment_result["word2ipu_csv"]),
         phoneme2ipu_csv=Path(alignment_result["phoneme2ipu_csv"]),
         phoneme_csv=Path(alignment_result["phoneme_csv"]),
+        alignment_retries_csv=Path(alignment_result["alignment_retries_csv"]),
     )
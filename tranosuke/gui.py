@@ -1,4 +1,5 @@
 import faulthandler
+import os
 import sys
 import traceback
 from pathlib import Path
@@ -10,6 +11,7 @@ from tranosuke.config import initialize_app, list_cuda_devices, read_user_config
 from tranosuke.corpus import build_corpus
 from tranosuke.denoise import denoise_media
 from tranosuke.media import convert_media_to_wavs
+from tranosuke.models import evict_models
 from tranosuke.morphology import analyze_ipu_csv
 from tranosuke.transcription import transcribe_media_to_ipu_csv
 
@@ -18,8 +20,10 @@ _FAULT_LOG_FILE = None
 
 
 QUALITY_OPTIONS = {
-    "スピード優先": {"model_name": "turbo", "beam_size": 5},
-    "クオリティ優先": {"model_name": "large-v3", "beam_size": 10},
+    "スピード優先": {"model_name": "turbo", "beam_size": 5, "profile": None},
+    "クオリティ優先": {"model_name": "large-v3", "beam_size": 10, "profile": None},
+    "CPU軽量 (int8)": {"model_name": "turbo", "beam_size": 5, "profile": "cpu-int8"},
+    "GPU高速 (int8_float16)": {"model_name": "turbo", "beam_size": 5, "profile": "gpu-int8_float16"},
 }
 
 
@@ -40,10 +44,10 @@ def _save_token_form() -> None:
         st.success("保存しました。")
 
 
-def _device_selector(key: str) -> tuple[str | None, int | None]:
+def _device_selector(key: str) -> tuple[str | None, int | None, list[int] | None]:
     devices = list_cuda_devices()
     options = ["自動"]
-    option_values: dict[str, tuple[str | None, int | None]] = {"自動": (None, None)}
+    option_values: dict[str, tuple[str | None, int | None, list[int] | None]] = {"自動": (None, None, None)}
 
     for device in devices:
         label = (
@@ -51,10 +55,15 @@ def _device_selector(key: str) -> tuple[str | None, int | None]:
             f"({device['free_gb']}GB / {device['total_gb']}GB 空き)"
         )
         options.append(label)
-        option_values[label] = ("cuda", int(device["index"]))
+        option_values[label] = ("cuda", int(device["index"]), None)
+
+    if len(devices) > 1:
+        label = f"全GPU ({len(devices)}枚で分担)"
+        options.append(label)
+        option_values[label] = ("cuda", None, [int(device["index"]) for device in devices])
 
     options.append("CPU")
-    option_values["CPU"] = ("cpu", None)
+    option_values["CPU"] = ("cpu", None, None)
 
     selected = st.selectbox("処理デバイス", options, key=key)
     return option_values[selected]
@@ -140,7 +149,12 @@ def _transcription_tab() -> None:
         step=0.01,
         key="transcribe_pause_threshold",
     )
-    device, device_index = _device_selector("transcribe_device")
+    channel_speakers = st.checkbox(
+        "チャンネルごとに別の話者として扱う（話者分離を行わない）",
+        value=False,
+        key="transcribe_channel_speakers",
+    )
+    device, device_index, device_indices = _device_selector("transcribe_device")
     if st.button("書き起こす", key="transcribe_run"):
         options = QUALITY_OPTIONS[quality]
         progress_callback, _, _ = _streamlit_progress()
@@ -148,11 +162,14 @@ def _transcription_tab() -> None:
             input_path,
             model_name=options["model_name"],
             beam_size=options["beam_size"],
+            profile=options["profile"],
             pause_threshold_ms=int(pause_threshold_s * 1000),
             device=device,
             device_index=device_index,
             segment_buffer_s=segment_buffer_s,
             progress_callback=progress_callback,
+            device_indices=device_indices,
+            channel_speakers=channel_speakers,
         )
         st.success(f"IPU書き起こしを保存しました: {csv_path}")
 
@@ -178,12 +195,32 @@ def _alignment_tab() -> None:
         step=0.1,
         key="align_buffer",
     )
+    align_workers = st.number_input(
+        "アラインメントの並列数",
+        min_value=1,
+        max_value=os.cpu_count() or 1,
+        value=1,
+        step=1,
+        key="align_workers",
+    )
+    incremental = st.checkbox(
+        "前回の結果を再利用し、変更されたIPUだけ再アラインメントする",
+        value=False,
+        key="align_incremental",
+    )
     if st.button("アラインメントする", key="align_run"):
         import pandas as pd
 
         df_ipu = pd.read_csv(ipu_csv)
         df_morph = pd.read_csv(morph_csv)
-        result = align_phonemes_and_words(audio_path, df_ipu, df_morph, alignment_buffer_s=alignment_buffer_s)
+        result = align_phonemes_and_words(
+            audio_path,
+            df_ipu,
+            df_morph,
+            alignment_buffer_s=alignment_buffer_s,
+            align_workers=int(align_workers),
+            previous_dir=Path(audio_path).expanduser().resolve().parent if incremental else None,
+        )
         st.success(f"phoneme.csv: {result['phoneme_csv']}")
         st.success(f"word.csv: {result['word_csv']}")
         st.success(f"word2IPU.csv: {result['word2ipu_csv']}")
@@ -212,7 +249,20 @@ def _corpus_tab() -> None:
         step=0.01,
         key="corpus_pause_threshold",
     )
-    device, device_index = _device_selector("corpus_device")
+    align_workers = st.number_input(
+        "アラインメントの並列数",
+        min_value=1,
+        max_value=os.cpu_count() or 1,
+        value=1,
+        step=1,
+        key="corpus_align_workers",
+    )
+    channel_speakers = st.checkbox(
+        "チャンネルごとに別の話者として扱う（話者分離を行わない）",
+        value=False,
+        key="corpus_channel_speakers",
+    )
+    device, device_index, device_indices = _device_selector("corpus_device")
     if st.button("コーパスを作成", key="corpus_run"):
         options = QUALITY_OPTIONS[quality]
         progress_callback, _, _ = _streamlit_progress()
@@ -222,11 +272,15 @@ def _corpus_tab() -> None:
                 use_denoise=use_denoise,
                 model_name=options["model_name"],
                 beam_size=options["beam_size"],
+                profile=options["profile"],
                 pause_threshold_ms=int(pause_threshold_s * 1000),
                 device=device,
                 device_index=device_index,
                 segment_buffer_s=segment_buffer_s,
                 progress_callback=progress_callback,
+                device_indices=device_indices,
+                channel_speakers=channel_speakers,
+                align_workers=int(align_workers),
             )
         except Exception as error:
             _show_error(error)
@@ -261,6 +315,10 @@ def main() -> None:
         initialize_app()
         st.success("再確認が完了しました。")
 
+    if st.button("読み込み済みモデルを解放する"):
+        evict_models()
+        st.success("Whisper と話者分離のモデルをメモリから解放しました。")
+
     with st.expander("アクセストークン設定"):
         _save_token_form()
 
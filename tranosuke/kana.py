@@ -0,0 +1,154 @@
+import re
+
+
+# Katakana (one or two characters) -> space-separated phonemes, in the
+# inventory pydomino is fed elsewhere: five vowels, N, cl, plain and
+# palatalized consonants. ー repeats the preceding phoneme.
+_ONSETS = {
+    "": "アイウエオ",
+    "k": "カキクケコ",
+    "g": "ガギグゲゴ",
+    "s": "サ_スセソ",
+    "z": "ザ_ズゼゾ",
+    "t": "タ__テト",
+    "d": "ダ__デド",
+    "n": "ナニヌネノ",
+    "h": "ハヒ_ヘホ",
+    "b": "バビブベボ",
+    "p": "パピプペポ",
+    "m": "マミムメモ",
+    "r": "ラリルレロ",
+}
+_VOWELS = "aiueo"
+
+_SINGLE_KANA = {
+    kana: f"{onset} {vowel}".strip()
+    for onset, row in _ONSETS.items()
+    for kana, vowel in zip(row, _VOWELS)
+    if kana != "_"
+}
+_SINGLE_KANA.update(
+    {
+        "シ": "sh i",
+        "ジ": "j i",
+        "チ": "ch i",
+        "ヂ": "j i",
+        "ツ": "ts u",
+        "ヅ": "z u",
+        "フ": "f u",
+        "ヤ": "y a",
+        "ユ": "y u",
+        "ヨ": "y o",
+        "ワ": "w a",
+        "ヰ": "i",
+        "ヱ": "e",
+        "ヲ": "o",
+        "ヴ": "v u",
+        "ァ": "a",
+        "ィ": "i",
+        "ゥ": "u",
+        "ェ": "e",
+        "ォ": "o",
+        "ャ": "y a",
+        "ュ": "y u",
+        "ョ": "y o",
+        "ヮ": "w a",
+        "ヵ": "k a",
+        "ヶ": "k e",
+        "ン": "N",
+        "ッ": "cl",
+    }
+)
+
+_PALATAL_ONSETS = {
+    "キ": "ky",
+    "ギ": "gy",
+    "シ": "sh",
+    "ジ": "j",
+    "チ": "ch",
+    "ヂ": "j",
+    "ニ": "ny",
+    "ヒ": "hy",
+    "ビ": "by",
+    "ピ": "py",
+    "ミ": "my",
+    "リ": "ry",
+}
+_DOUBLE_KANA = {
+    kana + small: f"{onset} {vowel}"
+    for kana, onset in _PALATAL_ONSETS.items()
+    for small, vowel in (("ャ", "a"), ("ュ", "u"), ("ョ", "o"), ("ェ", "e"))
+}
+_DOUBLE_KANA.update(
+    {
+        "ティ": "t i",
+        "トゥ": "t u",
+        "ディ": "d i",
+        "ドゥ": "d u",
+        "ツァ": "ts a",
+        "ツィ": "ts i",
+        "ツェ": "ts e",
+        "ツォ": "ts o",
+        "ファ": "f a",
+        "フィ": "f i",
+        "フェ": "f e",
+        "フォ": "f o",
+        "フュ": "hy u",
+        "ウィ": "w i",
+        "ウェ": "w e",
+        "ウォ": "w o",
+        "ヴァ": "v a",
+        "ヴィ": "v i",
+        "ヴェ": "v e",
+        "ヴォ": "v o",
+        "スィ": "s i",
+        "ズィ": "z i",
+        "イェ": "y e",
+        "クァ": "k w a",
+        "グァ": "g w a",
+    }
+)
+
+KANA_PHONEME_TABLE: dict[str, tuple[str, ...]] = {
+    kana: tuple(phonemes.split()) for kana, phonemes in {**_SINGLE_KANA, **_DOUBLE_KANA}.items()
+}
+_MAX_KANA_LENGTH = max(len(kana) for kana in KANA_PHONEME_TABLE)
+_LONG_VOWEL_MARK = "ー"
+_IGNORED = re.compile(r"[\s・=＝]")
+
+
+def _to_katakana(text: str) -> str:
+    # Hiragana ぁ..ゖ sit exactly 0x60 below the matching katakana.
+    return "".join(chr(ord(char) + 0x60) if "ぁ" <= char <= "ゖ" else char for char in text)
+
+
+def kana_to_phonemes(kana: str) -> str:
+    """
+    Convert a kana reading to space-separated phonemes by longest match
+    against ``KANA_PHONEME_TABLE``.
+
+    Returns "" when the reading contains anything the table does not cover,
+    the same way the romanization path rejects non-alphabetic output.
+    """
+    text = _IGNORED.sub("", _to_katakana(kana))
+    phonemes: list[str] = []
+    index = 0
+    while index < len(text):
+        if text[index] == _LONG_VOWEL_MARK:
+            # Lengthen whatever came before, so ンー (a common filler) reads as "N N".
+            if not phonemes:
+                return ""
+            phonemes.append(phonemes[-1])
+            index += 1
+            continue
+
+        for length in range(min(_MAX_KANA_LENGTH, len(text) - index), 0, -1):
+            match = KANA_PHONEME_TABLE.get(text[index:index + length])
+            if match is not None:
+                phonemes.extend(match)
+                index += length
+                break
+        else:
+            return ""
+
+    return " ".join(phonemes)
@@ -0,0 +1,126 @@
+import gc
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from tranosuke.config import read_user_config
+
+
+ModelKey = tuple[Hashable, ...]
+
+
+@dataclass
+class _RegistryEntry:
+    model: Any
+    size_bytes: int
+    device: str
+
+
+class ModelRegistry:
+    """
+    Keep loaded models in memory across jobs, keyed by
+    (model name, device, device index, compute type, ...).
+
+    Least recently used models are evicted once the estimated total size
+    exceeds ``max_bytes``. The model that was just requested is never evicted.
+    """
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, _RegistryEntry] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(
+        self,
+        key: ModelKey,
+        loader: Callable[[], Any],
+        size_estimator: Callable[[Any], int] | None = None,
+    ) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry.model
+
+            model = loader()
+            size_bytes = 0
+            if size_estimator is not None:
+                try:
+                    size_bytes = int(size_estimator(model))
+                except Exception:
+                    size_bytes = 0
+            self._entries[key] = _RegistryEntry(model=model, size_bytes=size_bytes, device=key[1])
+            self._enforce_limit(keep=key)
+            return model
+
+    def evict(self, key: ModelKey | None = None) -> None:
+        """Drop one model, or every model when ``key`` is None."""
+        with self._lock:
+            if key is None:
+                evicted = list(self._entries.values())
+                self._entries.clear()
+            else:
+                entry = self._entries.pop(key, None)
+                evicted = [entry] if entry is not None else []
+        _release(evicted)
+
+    def keys(self) -> list[ModelKey]:
+        with self._lock:
+            return list(self._entries)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._entries.values())
+
+    def _enforce_limit(self, keep: ModelKey) -> None:
+        if self.max_bytes is None:
+            return
+        evicted = []
+        while self.total_bytes() > self.max_bytes:
+            oldest = next((key for key in self._entries if key != keep), None)
+            if oldest is None:
+                break
+            evicted.append(self._entries.pop(oldest))
+        _release(evicted)
+
+
+def _release(entries: list[_RegistryEntry]) -> None:
+    if not entries:
+        return
+    uses_cuda = any(entry.device == "cuda" for entry in entries)
+    entries.clear()
+    gc.collect()
+    if uses_cuda:
+        try:
+            import torch
+
+            torch.cuda.empty_cache()
+        except Exception:
+            pass
+
+
+_REGISTRY: ModelRegistry | None = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def _configured_max_bytes() -> int | None:
+    value = read_user_config().get("MODEL_CACHE_MAX_GB")
+    if value in (None, ""):
+        return None
+    return int(float(value) * 1024**3)
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide registry, reading MODEL_CACHE_MAX_GB from config.yaml on first use."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = ModelRegistry(max_bytes=_configured_max_bytes())
+        return _REGISTRY
+
+
+def evict_models(key: ModelKey | None = None) -> None:
+    """Release cached Whisper and diarization models."""
+    get_model_registry().evict(key)
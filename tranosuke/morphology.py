@@ -1,3 +1,8 @@
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+from importlib import metadata
+import math
 from pathlib import Path
 import re
 
@@ -6,7 +11,21 @@ import numpy as np
 import pandas as pd
 import pykakasi
 
+from tranosuke.cache import ReadingCache, get_reading_cache
 from tranosuke.config import get_app_paths
+from tranosuke.kana import KANA_PHONEME_TABLE, kana_to_phonemes
+
+
+try:
+    _PYKAKASI_VERSION = metadata.version("pykakasi")
+except metadata.PackageNotFoundError:
+    _PYKAKASI_VERSION = "unknown"
+
+# Persisted conversions are only reused with the table or pykakasi version that produced them.
+KANA_CACHE_KIND = f"kana:{_PYKAKASI_VERSION}"
+PHONEME_CACHE_KIND = "phonemes:table:" + hashlib.sha1(repr(sorted(KANA_PHONEME_TABLE.items())).encode()).hexdigest()[:12]
+LEGACY_PHONEME_CACHE_KIND = f"phonemes:{_PYKAKASI_VERSION}"
+_NON_PHONEME_PATTERN = re.compile(r"[^A-Za-z ]")
 
 
 def kana_to_roman(kana: str, kakasi) -> str:
@@ -65,7 +84,49 @@ def roman_to_phonemes(roman: str) -> str:
     return " ".join(tokens)
 
 
-def _parse_morphemes(text: str, tagger, kakasi) -> list:
+def surface_to_kana(surface: str, kakasi) -> str:
+    return "".join(item["kana"] for item in kakasi.convert(surface))
+
+
+def reading_to_phonemes(reading: str, kakasi=None, legacy: bool = False) -> str:
+    """
+    Return the space-separated phonemes for a kana reading, or "" if it
+    cannot be converted.
+
+    By default the reading is looked up in the kana table. With ``legacy``
+    it is romanized through pykakasi and scanned by ``roman_to_phonemes``.
+    """
+    if not legacy:
+        return kana_to_phonemes(reading)
+    phonemes = roman_to_phonemes(kana_to_roman(reading, kakasi))
+    if _NON_PHONEME_PATTERN.search(phonemes):
+        return ""
+    return phonemes
+
+
+def _convert_cached(
+    reading_cache: ReadingCache | None, kind: str, text: str, convert: Callable[[str], str]
+) -> str:
+    if reading_cache is None:
+        return convert(text)
+    return reading_cache.get_or_compute(kind, text, convert)
+
+
+def _parse_morphemes(
+    text: str,
+    tagger,
+    kakasi,
+    reading_cache: ReadingCache | None = None,
+    legacy_phonemes: bool = False,
+) -> list:
+    phoneme_kind = LEGACY_PHONEME_CACHE_KIND if legacy_phonemes else PHONEME_CACHE_KIND
+
+    def to_kana(surface: str) -> str:
+        return surface_to_kana(surface, kakasi)
+
+    def to_phonemes(reading: str) -> str:
+        return reading_to_phonemes(reading, kakasi, legacy_phonemes)
+
     node = tagger.parseToNode(text)
     morphemes = []
 
@@ -86,13 +147,9 @@ def _parse_morphemes(text: str, tagger, kakasi) -> list:
             if morpheme[0] == "%":
                 morpheme[-1] = "パーセント"
             if pd.isna(morpheme[-1]):
-                morpheme[-1] = "".join(item["kana"] for item in kakasi.convert(morpheme[0]))
+                morpheme[-1] = _convert_cached(reading_cache, KANA_CACHE_KIND, morpheme[0], to_kana)
 
-            phonemes = roman_to_phonemes(kana_to_roman(morpheme[-1], kakasi))
-            if re.search(r"[^A-Za-z ]", phonemes):
-                phonemes = ""
-
-            morpheme.append(phonemes)
+            morpheme.append(_convert_cached(reading_cache, phoneme_kind, morpheme[-1], to_phonemes))
             morphemes.append(morpheme)
 
         node = node.next
@@ -116,27 +173,111 @@ def _resolve_mecab_dictionary_path(dic_path: Path) -> Path:
     return dic_path
 
 
-def analyze_ipus(df_ipu: pd.DataFrame) -> pd.DataFrame:
+def _create_tagger(dic_path: str) -> MeCab.Tagger:
+    tagger = MeCab.Tagger(f"-r /dev/null -d {dic_path}")
+    tagger.parse("")
+    return tagger
+
+
+# Tagger and kakasi of a worker process, created once by _init_morph_worker.
+_WORKER_ANALYZERS = None
+
+
+def _init_morph_worker(dic_path: str, reading_cache_path: str | None) -> None:
+    global _WORKER_ANALYZERS
+    _WORKER_ANALYZERS = (_create_tagger(dic_path), pykakasi.kakasi())
+    if reading_cache_path is not None:
+        get_reading_cache().load(reading_cache_path)
+
+
+def _parse_ipu_batch(
+    texts: list[str], legacy_phonemes: bool
+) -> tuple[list[list], int, int, list[tuple[str, str, str]]]:
+    """
+    Parse IPU texts in a worker. Also return the batch's reading-cache hits
+    and misses and the conversions it used, so the parent can keep them.
+    """
+    tagger, kakasi = _WORKER_ANALYZERS
+    reading_cache = get_reading_cache()
+    hits_before, misses_before = reading_cache.hits, reading_cache.misses
+    parsed = [_parse_morphemes(text, tagger, kakasi, reading_cache, legacy_phonemes) for text in texts]
+    return (
+        parsed,
+        reading_cache.hits - hits_before,
+        reading_cache.misses - misses_before,
+        reading_cache.take_updates(),
+    )
+
+
+def analyze_ipus(
+    df_ipu: pd.DataFrame,
+    persist_reading_cache: bool = False,
+    legacy_phonemes: bool = False,
+    workers: int = 1,
+) -> pd.DataFrame:
     """
     Convert IPU rows into morpheme rows with phoneme strings.
+
+    Readings are converted to phonemes with the kana table, or through
+    pykakasi romanization with ``legacy_phonemes``. Kana and phoneme
+    conversions go through the process-wide reading cache.
+    With ``persist_reading_cache`` it is also loaded from and saved to
+    ``~/.tranosuke/cache/readings.sqlite3``.
+
+    With ``workers`` > 1, IPUs are split into contiguous batches and parsed
+    by that many processes, each with its own Tagger and kakasi. Rows come
+    back in IPU order either way.
     """
-    kakasi = pykakasi.kakasi()
     paths = get_app_paths()
+    reading_cache = get_reading_cache()
+    if persist_reading_cache:
+        reading_cache.load(paths.reading_cache_path)
     dic_path = _resolve_mecab_dictionary_path(paths.unidic_dir)
     if paths.system == "Windows":
         dic_path = Path(str(dic_path).replace("\\", "/"))
 
-    tagger = MeCab.Tagger(f"-r /dev/null -d {dic_path}")
-    tagger.parse("")
-
-    rows = []
-    for _, ipu_row in df_ipu.iterrows():
-        if not pd.notna(ipu_row["IPU"]):
-            continue
-        morphemes = _parse_morphemes(ipu_row["IPU"], tagger, kakasi)
-        rows.extend(
-            [[ipu_row["filename"], ipu_row["speaker"], ipu_row["IPUID"]] + item for item in morphemes]
+    df_valid = df_ipu.loc[df_ipu["IPU"].notna(), ["filename", "speaker", "IPUID", "IPU"]]
+    texts = df_valid["IPU"].tolist()
+    if workers > 1 and len(texts) > 1:
+        batch_size = math.ceil(len(texts) / (workers * 4))
+        batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+        reading_cache_path = str(paths.reading_cache_path) if persist_reading_cache else None
+        worker_count = min(workers, len(batches))
+        parsed_ipus = []
+        hits = misses = 0
+        with ProcessPoolExecutor(
+            max_workers=worker_count,
+            initializer=_init_morph_worker,
+            initargs=(str(dic_path), reading_cache_path),
+        ) as executor:
+            for parsed, batch_hits, batch_misses, updates in executor.map(
+                _parse_ipu_batch, batches, [legacy_phonemes] * len(batches)
+            ):
+                parsed_ipus.extend(parsed)
+                hits += batch_hits
+                misses += batch_misses
+                reading_cache.merge(updates)
+        print(f"morphological analysis: {len(texts)} IPUs in {len(batches)} batches on {worker_count} workers")
+    else:
+        hits_before, misses_before = reading_cache.hits, reading_cache.misses
+        tagger = _create_tagger(str(dic_path))
+        kakasi = pykakasi.kakasi()
+        parsed_ipus = [_parse_morphemes(text, tagger, kakasi, reading_cache, legacy_phonemes) for text in texts]
+        hits = reading_cache.hits - hits_before
+        misses = reading_cache.misses - misses_before
+
+    if hits + misses:
+        print(f"reading cache: {hits} of {hits + misses} lookups hit ({hits / (hits + misses):.1%})")
+    if persist_reading_cache:
+        reading_cache.save(paths.reading_cache_path)
+
+    rows = [
+        [filename, speaker, ipu_id] + item
+        for filename, speaker, ipu_id, morphemes in zip(
+            df_valid["filename"], df_valid["speaker"], df_valid["IPUID"], parsed_ipus
         )
+        for item in morphemes
+    ]
 
     return pd.DataFrame(
         rows,
@@ -161,10 +302,51 @@ def analyze_ipus(df_ipu: pd.DataFrame) -> pd.DataFrame:
     )
 
 
-def analyze_ipu_csv(input_csv_path: str | Path, output_csv_path: str | Path | None = None) -> tuple[Path, pd.DataFrame]:
+def analyze_ipu_csv(
+    input_csv_path: str | Path,
+    output_csv_path: str | Path | None = None,
+    persist_reading_cache: bool = False,
+    legacy_phonemes: bool = False,
+    workers: int = 1,
+) -> tuple[Path, pd.DataFrame]:
     source = Path(input_csv_path).expanduser().resolve()
     df_ipu = pd.read_csv(source)
-    df_morph = analyze_ipus(df_ipu)
+    df_morph = analyze_ipus(
+        df_ipu,
+        persist_reading_cache=persist_reading_cache,
+        legacy_phonemes=legacy_phonemes,
+        workers=workers,
+    )
     target = Path(output_csv_path).expanduser().resolve() if output_csv_path else source.with_name("morpheme.csv")
     df_morph.to_csv(target, encoding="utf-8_sig", index=False)
     return target, df_morph
+
+
+def compare_phoneme_converters(df_ipu: pd.DataFrame) -> pd.DataFrame:
+    """
+    Analyze IPU rows and list the readings where the kana table and the
+    legacy romanization path produce different phonemes, most frequent first.
+    """
+    df_morph = analyze_ipus(df_ipu)
+    kakasi = pykakasi.kakasi()
+    counts = df_morph.groupby(["pron", "phonemes"], sort=False).agg(
+        orth=("orth", "first"), count=("orth", "size")
+    ).reset_index()
+    counts["legacy_phonemes"] = [reading_to_phonemes(reading, kakasi, legacy=True) for reading in counts["pron"]]
+    diff = counts.loc[counts["phonemes"] != counts["legacy_phonemes"]]
+    diff = diff.sort_values(["count", "pron"], ascending=[False, True], kind="mergesort")
+    print(
+        f"phoneme converters disagree on {int(diff['count'].sum())} of {len(df_morph)} morphemes "
+        f"({len(diff)} of {len(counts)} distinct readings)"
+    )
+    return diff[["pron", "orth", "count", "phonemes", "legacy_phonemes"]].reset_index(drop=True)
+
+
+def compare_phoneme_converters_csv(
+    input_csv_path: str | Path, output_csv_path: str | Path | None = None
+) -> tuple[Path, pd.DataFrame]:
+    source = Path(input_csv_path).expanduser().resolve()
+    df_diff = compare_phoneme_converters(pd.read_csv(source))
+    target = Path(output_csv_path).expanduser().resolve() if output_csv_path else source.with_name("phoneme_diff.csv")
+    df_diff.to_csv(target, encoding="utf-8_sig", index=False)
+    return target, df_diff
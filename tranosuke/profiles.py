@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PerformanceProfile:
+    """Whisper inference settings: CTranslate2 compute type, CPU threads and parallel workers."""
+
+    device: str
+    compute_type: str
+    cpu_threads: int = 0
+    num_workers: int = 1
+
+
+PERFORMANCE_PROFILES = {
+    "cpu-int8": PerformanceProfile(device="cpu", compute_type="int8", num_workers=2),
+    "cpu-fp32": PerformanceProfile(device="cpu", compute_type="float32"),
+    "gpu-fp16": PerformanceProfile(device="cuda", compute_type="float16"),
+    "gpu-int8_float16": PerformanceProfile(device="cuda", compute_type="int8_float16"),
+}
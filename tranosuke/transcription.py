@@ -1,7 +1,13 @@
+import hashlib
+import json
 import os
 import inspect
+import queue
 from collections.abc import Callable
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
+import time
 from pathlib import Path
 
 import numpy as np
@@ -11,17 +17,28 @@ import torchaudio
 from faster_whisper import WhisperModel
 from pyannote.audio import Pipeline
 from pyannote.audio.pipelines.utils.hook import ProgressHook
-from pyannote.core import Segment
+from pyannote.core import Annotation, Segment
 
-from tranosuke.config import detect_device, get_app_paths, read_user_config
+from tranosuke.audio import AudioSource, open_audio
+from tranosuke.cache import TranscriptionCache, get_transcription_cache
+from tranosuke.config import detect_device, get_app_paths, read_user_config, write_user_config
 from tranosuke.media import convert_media_to_wavs
-from tranosuke.utils import float_to_timecode
+from tranosuke.models import get_model_registry
+from tranosuke.profiles import PERFORMANCE_PROFILES, PerformanceProfile
+from tranosuke.utils import IntervalIndex, float_to_timecode
 
 
 ProgressCallback = Callable[[float, str], None]
 DEFAULT_PAUSE_THRESHOLD_MS = 200
 SILENCE_THRESHOLD_DB = 35.0
 MIN_SPEECH_CHUNK_S = 0.05
+CHANNEL_WINDOW_S = 60.0
+CHANNEL_WINDOW_OVERLAP_S = 2.0
+WHISPER_SAMPLE_RATE = 16000
+WHISPER_WINDOW_S = 30.0
+DIARIZATION_MODEL_NAME = "pyannote/speaker-diarization-community-1"
+LONG_FORM_SPEAKER_SIMILARITY = 0.5
+SAMPLE_AUDIO_PATH = Path(__file__).resolve().parent.parent / "sample" / "sample.wav"
 
 
 DEFAULT_FILLER_PROMPT = (
@@ -108,6 +125,83 @@ def _prepare_runtime_device(device: str | None, device_index: int | None) -> tup
     return "cuda", index
 
 
+def _resolve_shard_device_indices(
+    whisper_device: str,
+    device_index: int | None,
+    device_indices: list[int] | None,
+) -> list[int | None]:
+    """Return the GPU indices chunk transcription is spread over, dropping unavailable ones."""
+    if whisper_device != "cuda" or not device_indices:
+        return [device_index]
+
+    import torch
+
+    device_count = torch.cuda.device_count()
+    indices = [index for index in dict.fromkeys(int(value) for value in device_indices) if 0 <= index < device_count]
+    return indices or [device_index]
+
+
+def _lookup_performance_profile(profile: str | None) -> PerformanceProfile | None:
+    """Return the named profile, or the one saved by autotune when no name is given."""
+    name = profile or read_user_config().get("WHISPER_PROFILE")
+    if not name:
+        return None
+    if name not in PERFORMANCE_PROFILES:
+        if profile:
+            raise ValueError(f"Unknown performance profile: {profile}")
+        return None
+    return PERFORMANCE_PROFILES[name]
+
+
+def _prepare_whisper_models(
+    model_name: str,
+    device: str | None,
+    device_index: int | None,
+    device_indices: list[int] | None,
+    profile: str | None = None,
+    cpu_threads: int | None = None,
+    num_workers: int | None = None,
+) -> tuple[str, int | None, str, list[WhisperModel]]:
+    """
+    Resolve the runtime device and load one WhisperModel per GPU shard.
+
+    A profile only sets the device when ``device`` is None, and its compute
+    settings are dropped if the resolved device differs from the profile's.
+    The returned list repeats each model ``num_workers`` times so that many
+    chunks are decoded concurrently.
+    """
+    settings = _lookup_performance_profile(profile)
+    if device is None and settings is not None:
+        device = settings.device
+    if device_index is None and device_indices:
+        device_index = device_indices[0]
+    runtime_device, device_index = _prepare_runtime_device(device, device_index)
+    whisper_device = _resolve_whisper_device(runtime_device)
+    if settings is not None and settings.device != whisper_device:
+        settings = None
+
+    compute_type = settings.compute_type if settings is not None else "default"
+    if cpu_threads is None:
+        cpu_threads = settings.cpu_threads if settings is not None else 0
+    if num_workers is None:
+        num_workers = settings.num_workers if settings is not None else 1
+    num_workers = max(int(num_workers), 1)
+
+    shard_indices = _resolve_shard_device_indices(whisper_device, device_index, device_indices)
+    models = []
+    for index in shard_indices:
+        whisper_model = _get_whisper_model(
+            model_name,
+            whisper_device,
+            index,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+        )
+        models.extend([whisper_model] * num_workers)
+    return runtime_device, device_index, whisper_device, models
+
+
 def _patch_hf_hub_download_auth_keyword() -> None:
     import huggingface_hub
     import pyannote.audio.core.inference as pyannote_inference
@@ -155,7 +249,7 @@ def _load_diarization_pipeline(token: str, device: str, device_index: int | None
         kwargs["token"] = token
     else:
         kwargs["use_auth_token"] = token
-    pipeline = Pipeline.from_pretrained("pyannote/speaker-diarization-community-1", **kwargs)
+    pipeline = Pipeline.from_pretrained(DIARIZATION_MODEL_NAME, **kwargs)
 
     if device == "cuda":
         import torch
@@ -164,63 +258,130 @@ def _load_diarization_pipeline(token: str, device: str, device_index: int | None
     return pipeline
 
 
+def _energy_cumsum(audio: np.ndarray) -> np.ndarray:
+    """Prefix sums of squared samples, so every frame energy is one subtraction."""
+    cumulative = np.zeros(len(audio) + 1, dtype=np.float64)
+    np.cumsum(np.square(audio, dtype=np.float64), out=cumulative[1:])
+    return cumulative
+
+
+def _estimate_whisper_model_bytes(model_name: str) -> int:
+    from faster_whisper.utils import download_model
+
+    model_path = model_name if os.path.isdir(model_name) else download_model(model_name, local_files_only=True)
+    return sum(path.stat().st_size for path in Path(model_path).rglob("*") if path.is_file())
+
+
+def _estimate_pipeline_bytes(pipeline: Pipeline) -> int:
+    modules = list(getattr(pipeline, "_models", {}).values())
+    modules += [inference.model for inference in getattr(pipeline, "_inferences", {}).values()]
+    parameters = {
+        id(parameter): parameter
+        for module in modules
+        if hasattr(module, "parameters")
+        for parameter in module.parameters()
+    }
+    return sum(parameter.numel() * parameter.element_size() for parameter in parameters.values())
+
+
+def _get_whisper_model(
+    model_name: str,
+    device: str,
+    device_index: int | None = None,
+    compute_type: str = "default",
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+) -> WhisperModel:
+    """Return a cached WhisperModel, loading it on first use."""
+    index = device_index if device == "cuda" else None
+
+    def load() -> WhisperModel:
+        kwargs = {
+            "device": device,
+            "compute_type": compute_type,
+            "cpu_threads": cpu_threads,
+            "num_workers": num_workers,
+        }
+        if index is not None:
+            kwargs["device_index"] = index
+        return WhisperModel(model_name, **kwargs)
+
+    return get_model_registry().get(
+        (model_name, device, index, compute_type, cpu_threads, num_workers),
+        load,
+        lambda _: _estimate_whisper_model_bytes(model_name),
+    )
+
+
+def _get_diarization_pipeline(device: str, device_index: int | None = None) -> Pipeline:
+    """Return a cached diarization pipeline, loading it on first use."""
+    index = (device_index or 0) if device == "cuda" else None
+    return get_model_registry().get(
+        (DIARIZATION_MODEL_NAME, device, index, "default"),
+        lambda: _load_diarization_pipeline(_load_huggingface_token(), device, device_index),
+        _estimate_pipeline_bytes,
+    )
+
+
 def _detect_non_silent_chunks(
     audio_segment: np.ndarray,
     sample_rate: int,
     absolute_start: float,
     min_silence_s: float = DEFAULT_PAUSE_THRESHOLD_MS / 1000.0,
     silence_threshold_db: float = SILENCE_THRESHOLD_DB,
+    min_peak: float = 0.0,
+    whole_segment_fallback: bool = True,
 ) -> list[tuple[float, float]]:
+    """
+    Split a segment into speech intervals from its 20 ms frame RMS envelope.
+
+    The silence threshold is relative to the segment's peak, raised to
+    ``min_peak`` if that is higher. A segment without detectable speech is
+    returned whole, as diarization says someone speaks there, unless
+    ``whole_segment_fallback`` is off.
+    """
     if audio_segment.size == 0:
         return []
 
     audio = audio_segment.astype("float32", copy=False)
-    peak = float(np.max(np.abs(audio)))
-    if peak <= 1e-6:
+    local_peak = float(np.max(np.abs(audio)))
+    if local_peak <= 1e-6:
         return []
+    peak = max(local_peak, min_peak)
+
+    energy_cumsum = _energy_cumsum(audio)
 
     frame_length = max(int(0.02 * sample_rate), 1)
     hop_length = max(int(0.01 * sample_rate), 1)
     threshold = peak * (10 ** (-silence_threshold_db / 20.0))
 
-    speech_frames = []
-    for start_sample in range(0, len(audio), hop_length):
-        end_sample = min(start_sample + frame_length, len(audio))
-        frame = audio[start_sample:end_sample]
-        if frame.size == 0:
-            continue
-        rms = float(np.sqrt(np.mean(frame * frame)))
-        if rms > threshold:
-            speech_frames.append((start_sample, end_sample))
+    frame_starts = np.arange(0, len(audio), hop_length)
+    frame_ends = np.minimum(frame_starts + frame_length, len(audio))
+    frame_energy = (energy_cumsum[frame_ends] - energy_cumsum[frame_starts]) / (frame_ends - frame_starts)
+    is_speech = np.sqrt(np.maximum(frame_energy, 0.0)) > threshold
+    speech_starts = frame_starts[is_speech]
+    speech_ends = frame_ends[is_speech]
 
-    if not speech_frames:
-        return [(absolute_start, absolute_start + len(audio) / sample_rate)]
+    if speech_starts.size == 0:
+        return [(absolute_start, absolute_start + len(audio) / sample_rate)] if whole_segment_fallback else []
 
-    intervals = []
-    current_start, current_end = speech_frames[0]
     min_silence_samples = int(min_silence_s * sample_rate)
     min_speech_samples = int(MIN_SPEECH_CHUNK_S * sample_rate)
 
-    for start_sample, end_sample in speech_frames[1:]:
-        if start_sample - current_end < min_silence_samples:
-            current_end = max(current_end, end_sample)
-        else:
-            if current_end - current_start >= min_speech_samples:
-                intervals.append((current_start, current_end))
-            current_start, current_end = start_sample, end_sample
-
-    if current_end - current_start >= min_speech_samples:
-        intervals.append((current_start, current_end))
+    breaks = np.flatnonzero(speech_starts[1:] - speech_ends[:-1] >= min_silence_samples)
+    interval_starts = speech_starts[np.concatenate(([0], breaks + 1))]
+    interval_ends = speech_ends[np.concatenate((breaks, [len(speech_ends) - 1]))]
+    keep = interval_ends - interval_starts >= min_speech_samples
 
-    if not intervals:
-        return [(absolute_start, absolute_start + len(audio) / sample_rate)]
+    if not keep.any():
+        return [(absolute_start, absolute_start + len(audio) / sample_rate)] if whole_segment_fallback else []
 
     return [
         (
-            absolute_start + start_sample / sample_rate,
-            absolute_start + min(end_sample, len(audio)) / sample_rate,
+            absolute_start + int(start_sample) / sample_rate,
+            absolute_start + int(end_sample) / sample_rate,
         )
-        for start_sample, end_sample in intervals
+        for start_sample, end_sample in zip(interval_starts[keep], interval_ends[keep])
     ]
 
 
@@ -243,14 +404,28 @@ def _merge_speech_chunks(
     return merged
 
 
+def _to_whisper_audio(waveform, sample_rate: int) -> np.ndarray:
+    """Return a contiguous float32 mono array at the sample rate faster-whisper expects."""
+    if sample_rate != WHISPER_SAMPLE_RATE:
+        waveform = torchaudio.functional.resample(waveform, sample_rate, WHISPER_SAMPLE_RATE)
+    return np.ascontiguousarray(waveform.squeeze(0).numpy(), dtype=np.float32)
+
+
+def _write_temp_wav(chunk_audio: np.ndarray, sample_rate: int) -> str:
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_wav_file:
+        tmp_path = tmp_wav_file.name
+    sf.write(tmp_path, chunk_audio, sample_rate)
+    return tmp_path
+
+
 def _transcribe_segment_text(
     model: WhisperModel,
-    tmp_path: str,
+    audio: str | np.ndarray,
     beam_size: int,
     language: str,
 ) -> str:
     segments, _ = model.transcribe(
-        tmp_path,
+        audio,
         beam_size=beam_size,
         word_timestamps=False,
         language=language,
@@ -259,92 +434,435 @@ def _transcribe_segment_text(
     return "".join(segment.text.strip() for segment in segments if segment.text).strip()
 
 
-def _is_cuda_device_ordinal_error(error: RuntimeError) -> bool:
-    message = str(error)
-    return "cudaErrorInvalidDevice" in message or "invalid device ordinal" in message
+def _transcribe_segment_texts_batched(
+    model: WhisperModel,
+    audios: list[np.ndarray],
+    beam_size: int,
+    language: str,
+) -> list[str]:
+    """Decode several chunks of at most 30 seconds in one CTranslate2 generate call."""
+    from faster_whisper.audio import pad_or_trim
+    from faster_whisper.tokenizer import Tokenizer
+
+    tokenizer = Tokenizer(
+        model.hf_tokenizer,
+        model.model.is_multilingual,
+        task="transcribe",
+        language=language,
+    )
+    prompt = model.get_prompt(
+        tokenizer,
+        tokenizer.encode(" " + DEFAULT_FILLER_PROMPT.strip()),
+        without_timestamps=True,
+    )
+    features = np.stack([pad_or_trim(model.feature_extractor(audio)[..., :-1]) for audio in audios])
+    encoder_output = model.encode(features)
+    results = model.model.generate(
+        encoder_output,
+        [prompt] * len(audios),
+        beam_size=beam_size,
+        max_length=model.max_length,
+    )
+    return [tokenizer.decode(result.sequences_ids[0]).strip() for result in results]
 
 
-def _report_progress(progress_callback: ProgressCallback | None, value: float, message: str) -> None:
-    if progress_callback is None:
-        return
-    progress_callback(max(0.0, min(1.0, value)), message)
+def _batch_chunk_jobs(chunk_jobs: list[dict], batch_size: int) -> list[list[int]]:
+    """Group chunk job positions into batches, keeping chunks longer than one Whisper window on their own."""
+    batches = []
+    current = []
+    for position, job in enumerate(chunk_jobs):
+        if batch_size <= 1 or float(job["end"]) - float(job["start"]) > WHISPER_WINDOW_S:
+            batches.append([position])
+            continue
+        current.append(position)
+        if len(current) >= batch_size:
+            batches.append(current)
+            current = []
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _transcribe_chunk_batch(
+    whisper_model: WhisperModel,
+    audios: list[np.ndarray],
+    beam_size: int,
+    language: str,
+    use_temp_files: bool,
+    sample_rate: int,
+) -> list[str]:
+    if len(audios) > 1:
+        return _transcribe_segment_texts_batched(whisper_model, audios, beam_size, language)
+
+    tmp_path = None
+    try:
+        audio_input = audios[0]
+        if use_temp_files:
+            tmp_path = _write_temp_wav(audio_input, sample_rate)
+            audio_input = tmp_path
+        return [_transcribe_segment_text(whisper_model, audio_input, beam_size, language)]
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _chunk_cache_key(audio: np.ndarray, model_name: str, beam_size: int, language: str) -> str:
+    digest = hashlib.sha256(np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+    digest.update(f"\0{model_name}\0{beam_size}\0{language}\0{DEFAULT_FILLER_PROMPT}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _transcribe_chunk_jobs(
+    chunk_jobs: list[dict],
+    load_audio: Callable[[dict], np.ndarray],
+    models: list[WhisperModel],
+    model_name: str,
+    whisper_device: str,
+    beam_size: int,
+    language: str,
+    batch_size: int = 1,
+    use_temp_files: bool = False,
+    sample_rate: int = WHISPER_SAMPLE_RATE,
+    progress: Callable[[int, int], None] | None = None,
+    cache: TranscriptionCache | None = None,
+) -> list[str]:
+    """
+    Transcribe every chunk job and return one text per job, in job order.
 
+    With a ``cache``, chunks whose samples, model, beam size, language and
+    prompt were transcribed before reuse the stored text, and only the rest
+    reach Whisper. New texts are stored batch by batch, so a crashed run
+    resumes from where it stopped.
 
-def transcribe_ipus(
-    audio_path: str | Path,
-    model_name: str = "turbo",
-    pause_threshold_ms: int = DEFAULT_PAUSE_THRESHOLD_MS,
-    beam_size: int = 5,
-    language: str = "ja",
-    device: str | None = None,
-    device_index: int | None = None,
-    segment_buffer_s: float = 0.1,
-    progress_callback: ProgressCallback | None = None,
-) -> pd.DataFrame:
-    """
-    Perform diarization and whisper transcription, then group words into IPUs.
+    ``load_audio(job)`` returns the audio Whisper should see for a job's
+    ``start``/``end`` span; it is called from the worker that transcribes the batch.
+
+    With several models (one per GPU), batches run in worker threads and each
+    worker borrows whichever model is free, so faster cards take more batches.
     """
-    source = Path(audio_path).expanduser().resolve()
-    _report_progress(progress_callback, 0.01, "音声を読み込んでいます")
-    waveform, sample_rate = torchaudio.load(str(source))
-    if waveform.ndim > 1 and waveform.shape[0] > 1:
-        waveform = waveform.mean(dim=0, keepdim=True)
-    wav = waveform.squeeze(0).numpy()
+    texts = [""] * len(chunk_jobs)
+    done = 0
+    keys: list[str] = []
+    pending = list(range(len(chunk_jobs)))
+    if cache is not None:
+        keys = [_chunk_cache_key(load_audio(job), model_name, beam_size, language) for job in chunk_jobs]
+        cached = cache.get_many(keys)
+        pending = []
+        for position, key in enumerate(keys):
+            if key in cached:
+                texts[position] = cached[key]
+                done += 1
+            else:
+                pending.append(position)
+        if progress is not None and done:
+            progress(done, len(chunk_jobs))
+
+    batches = [
+        [pending[index] for index in batch]
+        for batch in _batch_chunk_jobs(
+            [chunk_jobs[position] for position in pending], 1 if use_temp_files else batch_size
+        )
+    ]
+    model_pool: queue.Queue[WhisperModel] = queue.Queue()
+    for whisper_model in models:
+        model_pool.put(whisper_model)
 
-    _report_progress(progress_callback, 0.05, "モデルを準備しています")
-    runtime_device, device_index = _prepare_runtime_device(device, device_index)
-    whisper_device = _resolve_whisper_device(runtime_device)
-    whisper_kwargs = {"device": whisper_device}
-    if whisper_device == "cuda" and device_index is not None:
-        whisper_kwargs["device_index"] = device_index
-    model = WhisperModel(model_name, **whisper_kwargs)
-    fallback_cpu_model = None
-    pipeline = _load_diarization_pipeline(_load_huggingface_token(), runtime_device, device_index)
+    def run(batch: list[int]) -> list[str]:
+        audios = [load_audio(chunk_jobs[position]) for position in batch]
+        whisper_model = model_pool.get()
+        try:
+            try:
+                return _transcribe_chunk_batch(
+                    whisper_model, audios, beam_size, language, use_temp_files, sample_rate
+                )
+            except RuntimeError as error:
+                if whisper_device != "cuda" or not _is_cuda_device_ordinal_error(error):
+                    raise
+                return _transcribe_chunk_batch(
+                    _get_whisper_model(model_name, "cpu"), audios, beam_size, language, use_temp_files, sample_rate
+                )
+        finally:
+            model_pool.put(whisper_model)
+
+    def store(batch: list[int], batch_texts: list[str]) -> None:
+        nonlocal done
+        for position, text in zip(batch, batch_texts):
+            texts[position] = text
+        if cache is not None:
+            cache.put_many({keys[position]: text for position, text in zip(batch, batch_texts)})
+        done += len(batch)
+        if progress is not None:
+            progress(done, len(chunk_jobs))
+
+    if len(models) <= 1:
+        for batch in batches:
+            store(batch, run(batch))
+        return texts
+
+    with ThreadPoolExecutor(max_workers=len(models), thread_name_prefix="tranosuke_whisper") as executor:
+        futures = {executor.submit(run, batch): batch for batch in batches}
+        for future in as_completed(futures):
+            store(futures[future], future.result())
+    return texts
+
+
+def _resample_for_whisper(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    if sample_rate == WHISPER_SAMPLE_RATE:
+        return np.ascontiguousarray(audio, dtype=np.float32)
+    import torch
 
-    _report_progress(progress_callback, 0.12, "話者分離を実行しています")
-    with ProgressHook() as hook:
-        diarization = pipeline({"waveform": waveform, "sample_rate": sample_rate}, hook=hook)
+    return _to_whisper_audio(torch.from_numpy(np.ascontiguousarray(audio)).unsqueeze(0), sample_rate)
+
+
+def _window_bounds(total_samples: int, sample_rate: int, window_s: float, overlap_s: float) -> list[tuple[int, int]]:
+    window = max(int(window_s * sample_rate), 1)
+    overlap = min(max(int(overlap_s * sample_rate), 0), window // 2)
+    bounds = []
+    start = 0
+    while True:
+        end = min(start + window, total_samples)
+        bounds.append((start, end))
+        if end >= total_samples:
+            return bounds
+        start += window - overlap
+
+
+def _window_speaker_embeddings(diarization) -> dict[str, np.ndarray]:
+    embeddings = getattr(diarization, "speaker_embeddings", None)
+    if embeddings is None:
+        return {}
+    labels = diarization.speaker_diarization.labels()
+    return {
+        label: np.asarray(embeddings[index], dtype=np.float64)
+        for index, label in enumerate(labels)
+        if index < len(embeddings) and np.all(np.isfinite(embeddings[index]))
+    }
+
+
+def _match_window_speakers(
+    local_turns: list[tuple[Segment, str]],
+    local_embeddings: dict[str, np.ndarray],
+    previous_turns: list[tuple[Segment, str]],
+    overlap_region: Segment | None,
+    global_embeddings: dict[str, np.ndarray | None],
+) -> dict[str, str]:
+    """
+    Map the speaker labels of one window onto labels shared by the whole file.
 
-    ipus = []
-    pause_threshold_s = max(pause_threshold_ms, 0) / 1000.0
-    merged_turns = merge_consecutive_turns(diarization.speaker_diarization, max_gap_s=pause_threshold_s)
-    total_turns = max(len(merged_turns), 1)
-    _report_progress(progress_callback, 0.25, f"話者区間を処理しています 0/{len(merged_turns)}")
+    Speakers are first paired by how long they talk together inside the overlap
+    with the previous window, then by embedding similarity, and otherwise get
+    a new label. ``global_embeddings`` is updated in place.
+    """
+    mapping: dict[str, str] = {}
+    used: set[str] = set()
+
+    if overlap_region is not None:
+        scores: dict[tuple[str, str], float] = {}
+        for local_turn, local_label in local_turns:
+            local_part = local_turn & overlap_region
+            if not local_part:
+                continue
+            for previous_turn, global_label in previous_turns:
+                shared = local_part & previous_turn
+                if shared:
+                    key = (local_label, global_label)
+                    scores[key] = scores.get(key, 0.0) + shared.duration
+        for (local_label, global_label), _ in sorted(scores.items(), key=lambda item: -item[1]):
+            if local_label in mapping or global_label in used:
+                continue
+            mapping[local_label] = global_label
+            used.add(global_label)
+
+    for local_label in sorted({label for _, label in local_turns}):
+        if local_label in mapping:
+            continue
+        embedding = local_embeddings.get(local_label)
+        best_label = None
+        best_score = LONG_FORM_SPEAKER_SIMILARITY
+        if embedding is not None:
+            for global_label, global_embedding in global_embeddings.items():
+                if global_label in used or global_embedding is None:
+                    continue
+                score = float(
+                    np.dot(embedding, global_embedding)
+                    / (np.linalg.norm(embedding) * np.linalg.norm(global_embedding) + 1e-12)
+                )
+                if score > best_score:
+                    best_label, best_score = global_label, score
+        if best_label is None:
+            best_label = f"SPEAKER_{len(global_embeddings):02d}"
+            global_embeddings[best_label] = None
+        mapping[local_label] = best_label
+        used.add(best_label)
+
+    for local_label, embedding in local_embeddings.items():
+        global_label = mapping.get(local_label)
+        if global_label is None:
+            continue
+        unit = embedding / (np.linalg.norm(embedding) + 1e-12)
+        current = global_embeddings.get(global_label)
+        global_embeddings[global_label] = unit if current is None else current + unit
+    return mapping
+
+
+def _diarize_long_form(
+    pipeline: Pipeline,
+    audio_source: AudioSource,
+    window_s: float,
+    overlap_s: float,
+    progress: Callable[[int, int], None] | None = None,
+) -> Annotation:
+    """Diarize overlapping windows one at a time and stitch the speaker labels."""
+    import torch
+
+    sample_rate = audio_source.sample_rate
+    windows = _window_bounds(len(audio_source), sample_rate, window_s, overlap_s)
+    stitched = Annotation()
+    global_embeddings: dict[str, np.ndarray | None] = {}
+    previous_turns: list[tuple[Segment, str]] = []
+    track = 0
+
+    for window_number, (start_sample, end_sample) in enumerate(windows):
+        window_start = start_sample / sample_rate
+        window_end = end_sample / sample_rate
+        audio = audio_source.read(start_sample, end_sample)
+        diarization = pipeline({"waveform": torch.from_numpy(audio).unsqueeze(0), "sample_rate": sample_rate})
+        del audio
+
+        local_turns = [
+            (Segment(window_start + float(turn.start), window_start + float(turn.end)), label)
+            for turn, _, label in diarization.speaker_diarization.itertracks(yield_label=True)
+        ]
+        overlap_region = None
+        keep_start = 0.0
+        if window_number > 0:
+            previous_end = windows[window_number - 1][1] / sample_rate
+            overlap_region = Segment(window_start, previous_end)
+            keep_start = (window_start + previous_end) / 2
+        keep_end = window_end
+        if window_number + 1 < len(windows):
+            keep_end = (windows[window_number + 1][0] / sample_rate + window_end) / 2
+
+        mapping = _match_window_speakers(
+            local_turns,
+            _window_speaker_embeddings(diarization),
+            previous_turns,
+            overlap_region,
+            global_embeddings,
+        )
+        previous_turns = [(turn, mapping[label]) for turn, label in local_turns]
+        for turn, label in previous_turns:
+            clipped = Segment(max(float(turn.start), keep_start), min(float(turn.end), keep_end))
+            if clipped.duration > 0:
+                stitched[clipped, track] = label
+                track += 1
+
+        if progress is not None:
+            progress(window_number + 1, len(windows))
+    return stitched
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _diarization_cache_path(
+    source: Path,
+    long_form_window_s: float | None,
+    long_form_overlap_s: float,
+) -> Path:
+    """Cache file for one audio content, pipeline version and windowing setup."""
+    from pyannote.audio import __version__ as pyannote_version
+
+    settings = json.dumps(
+        {
+            "audio": _hash_file(source),
+            "pipeline": DIARIZATION_MODEL_NAME,
+            "pyannote": pyannote_version,
+            "long_form_window_s": long_form_window_s,
+            "long_form_overlap_s": long_form_overlap_s if long_form_window_s else None,
+        },
+        sort_keys=True,
+    )
+    key = hashlib.sha256(settings.encode("utf-8")).hexdigest()
+    return get_app_paths().diarization_cache_dir / f"{key}.json"
+
+
+def _load_cached_diarization(cache_path: Path) -> Annotation | None:
+    if not cache_path.exists():
+        return None
+    try:
+        data = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    annotation = Annotation()
+    for track, (start, end, label) in enumerate(data.get("turns", [])):
+        annotation[Segment(float(start), float(end)), track] = str(label)
+    return annotation
+
+
+def _save_cached_diarization(
+    cache_path: Path,
+    speaker_diarization: Annotation,
+    embeddings: dict[str, np.ndarray] | None = None,
+) -> None:
+    data = {
+        "turns": [
+            [float(turn.start), float(turn.end), str(label)]
+            for turn, _, label in speaker_diarization.itertracks(yield_label=True)
+        ],
+        "embeddings": {label: embedding.tolist() for label, embedding in (embeddings or {}).items()},
+    }
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+
+def _detect_speech_chunks(
+    merged_turns: list[tuple[Segment, str]],
+    read_samples: Callable[[int, int], np.ndarray],
+    sample_rate: int,
+    total_samples: int,
+    segment_buffer_s: float,
+    pause_threshold_s: float,
+    progress: Callable[[int, int], None] | None = None,
+) -> list[dict[str, float | str]]:
+    """Split each diarization turn into speech chunks and merge same-speaker neighbours."""
+    duration_s = total_samples / sample_rate
+    turn_bounds = IntervalIndex(
+        (float(turn.start) for turn, _ in merged_turns),
+        (float(turn.end) for turn, _ in merged_turns),
+    )
 
     speech_chunks = []
-    for turn_index, (turn, speaker_id) in enumerate(merged_turns, start=1):
+    for turn_number, (turn, speaker_id) in enumerate(merged_turns, start=1):
         turn_start = float(turn.start)
         turn_end = float(turn.end)
-        previous_turns = [
-            other_turn
-            for other_turn, _ in merged_turns
-            if float(other_turn.end) <= turn_start
-        ]
-        next_turns = [
-            other_turn
-            for other_turn, _ in merged_turns
-            if float(other_turn.start) >= turn_end
-        ]
-        previous_end = max((float(other_turn.end) for other_turn in previous_turns), default=0.0)
-        next_start = min(
-            (float(other_turn.start) for other_turn in next_turns),
-            default=len(wav) / sample_rate,
-        )
+        previous_end = turn_bounds.previous_end(turn_start)
+        next_start = turn_bounds.next_start(turn_end, default=duration_s)
         detection_start = max(turn_start - segment_buffer_s, previous_end, 0.0)
-        detection_end = min(turn_end + segment_buffer_s, next_start, len(wav) / sample_rate)
+        detection_end = min(turn_end + segment_buffer_s, next_start, duration_s)
         start_sample = max(int(detection_start * sample_rate), 0)
-        end_sample = min(int(detection_end * sample_rate), len(wav))
-        detection_audio = wav[start_sample:end_sample]
+        end_sample = min(int(detection_end * sample_rate), total_samples)
         speaker = _speaker_label_to_name(speaker_id)
 
-        chunks = _detect_non_silent_chunks(
-            detection_audio,
-            sample_rate,
-            detection_start,
-            min_silence_s=pause_threshold_s,
-        )
-        chunks = [(start, end) for start, end in chunks if end > start]
+        chunks = []
+        if end_sample > start_sample:
+            chunks = _detect_non_silent_chunks(
+                read_samples(start_sample, end_sample),
+                sample_rate,
+                detection_start,
+                min_silence_s=pause_threshold_s,
+            )
         for speech_start, speech_end in chunks:
+            if speech_end <= speech_start:
+                continue
             speech_chunks.append(
                 {
                     "speaker": speaker,
@@ -354,68 +872,101 @@ def transcribe_ipus(
                 }
             )
 
-        _report_progress(
-            progress_callback,
-            0.25 + 0.20 * (turn_index / total_turns),
-            f"無音区間を検出しています {turn_index}/{len(merged_turns)}",
-        )
+        if progress is not None:
+            progress(turn_number, len(merged_turns))
+
+    return _merge_speech_chunks(speech_chunks, pause_threshold_s)
+
+
+def _detect_channel_speech_chunks(
+    audio_source: AudioSource,
+    speaker_id: str,
+    pause_threshold_s: float,
+    window_s: float = CHANNEL_WINDOW_S,
+    overlap_s: float = CHANNEL_WINDOW_OVERLAP_S,
+) -> list[dict[str, float | str]]:
+    """
+    Silence-segment a whole single-speaker channel in overlapping windows.
+
+    Only one window is in memory at a time. Each window is thresholded
+    against its own peak, floored at the median window peak of the channel,
+    so a cough sets the level for its own window only and windows holding
+    nothing but background noise stay silent. Chunks cut at a window edge
+    overlap the next window and are merged back together.
+    """
+    sample_rate = audio_source.sample_rate
+    total_samples = len(audio_source)
+    window_samples = max(int(window_s * sample_rate), 1)
+    step_samples = max(window_samples - int(overlap_s * sample_rate), 1)
+    window_starts = range(0, max(total_samples - window_samples, 0) + step_samples, step_samples)
+    window_bounds = [(start, min(start + window_samples, total_samples)) for start in window_starts]
+    window_bounds = [(start, end) for start, end in window_bounds if end > start]
+    if not window_bounds:
+        return []
+
+    window_peaks = [float(np.max(np.abs(audio_source.read(start, end)))) for start, end in window_bounds]
+    reference_peak = float(np.median(window_peaks))
+    speaker = _speaker_label_to_name(speaker_id)
+
+    speech_chunks = []
+    for start_sample, end_sample in window_bounds:
+        for speech_start, speech_end in _detect_non_silent_chunks(
+            audio_source.read(start_sample, end_sample),
+            sample_rate,
+            start_sample / sample_rate,
+            min_silence_s=pause_threshold_s,
+            min_peak=reference_peak,
+            whole_segment_fallback=False,
+        ):
+            if speech_end > speech_start:
+                speech_chunks.append(
+                    {"speaker": speaker, "speaker_id": speaker_id, "start": speech_start, "end": speech_end}
+                )
+    return _merge_speech_chunks(speech_chunks, pause_threshold_s)
+
 
-    speech_chunks = _merge_speech_chunks(speech_chunks, pause_threshold_s)
-    total_chunks = max(len(speech_chunks), 1)
-    for chunk_index, chunk in enumerate(speech_chunks, start=1):
+def _build_chunk_jobs(
+    speech_chunks: list[dict[str, float | str]],
+    sample_rate: int,
+    total_samples: int,
+    segment_buffer_s: float,
+) -> list[dict]:
+    """Attach the buffered span Whisper should transcribe to every speech chunk."""
+    duration_s = total_samples / sample_rate
+    chunk_bounds = IntervalIndex(
+        (float(chunk["start"]) for chunk in speech_chunks),
+        (float(chunk["end"]) for chunk in speech_chunks),
+    )
+    chunk_jobs = []
+    for chunk in speech_chunks:
         speech_start = float(chunk["start"])
         speech_end = float(chunk["end"])
-        previous_chunks = [
-            other_chunk
-            for other_chunk in speech_chunks
-            if other_chunk is not chunk and float(other_chunk["end"]) <= speech_start
-        ]
-        next_chunks = [
-            other_chunk
-            for other_chunk in speech_chunks
-            if other_chunk is not chunk and float(other_chunk["start"]) >= speech_end
-        ]
-        previous_chunk_end = max(
-            (float(other_chunk["end"]) for other_chunk in previous_chunks),
-            default=0.0,
-        )
-        next_chunk_start = min(
-            (float(other_chunk["start"]) for other_chunk in next_chunks),
-            default=len(wav) / sample_rate,
-        )
+        previous_chunk_end = chunk_bounds.previous_end(speech_start)
+        next_chunk_start = chunk_bounds.next_start(speech_end, default=duration_s)
         transcribe_start = max(speech_start - segment_buffer_s, previous_chunk_end, 0.0)
-        transcribe_end = min(speech_end + segment_buffer_s, next_chunk_start, len(wav) / sample_rate)
+        transcribe_end = min(speech_end + segment_buffer_s, next_chunk_start, duration_s)
         chunk_start_sample = max(int(transcribe_start * sample_rate), 0)
-        chunk_end_sample = min(int(transcribe_end * sample_rate), len(wav))
-        chunk_audio = wav[chunk_start_sample:chunk_end_sample]
-        if chunk_audio.size == 0:
+        chunk_end_sample = min(int(transcribe_end * sample_rate), total_samples)
+        if chunk_end_sample <= chunk_start_sample:
             continue
+        chunk_jobs.append({"chunk": chunk, "start": transcribe_start, "end": transcribe_end})
+    return chunk_jobs
 
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_wav_file:
-            tmp_path = tmp_wav_file.name
-
-        try:
-            sf.write(tmp_path, chunk_audio, sample_rate)
-            try:
-                text = _transcribe_segment_text(model, tmp_path, beam_size, language)
-            except RuntimeError as error:
-                if whisper_device != "cuda" or not _is_cuda_device_ordinal_error(error):
-                    raise
-                if fallback_cpu_model is None:
-                    fallback_cpu_model = WhisperModel(model_name, device="cpu")
-                text = _transcribe_segment_text(fallback_cpu_model, tmp_path, beam_size, language)
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
 
+def _build_ipu_rows(filename: str, chunk_jobs: list[dict], texts: list[str]) -> list[dict]:
+    ipus = []
+    for job, text in zip(chunk_jobs, texts):
         text = _normalize_ipu_text([text])
         if not text:
             continue
 
+        chunk = job["chunk"]
+        speech_start = float(chunk["start"])
+        speech_end = float(chunk["end"])
         speaker = str(chunk["speaker"])
         ipus.append(
             {
-                "filename": source.stem,
+                "filename": filename,
                 "speaker": speaker,
                 "tier": f"IPU_{speaker}",
                 "IPUID": f"{float_to_timecode(speech_start)}{speaker}",
@@ -424,17 +975,322 @@ def transcribe_ipus(
                 "IPU": text,
             }
         )
+    return ipus
+
+
+def _is_cuda_device_ordinal_error(error: RuntimeError) -> bool:
+    message = str(error)
+    return "cudaErrorInvalidDevice" in message or "invalid device ordinal" in message
 
-        _report_progress(
-            progress_callback,
-            0.45 + 0.53 * (chunk_index / total_chunks),
-            f"書き起こしています {chunk_index}/{len(speech_chunks)}",
+
+def _report_progress(progress_callback: ProgressCallback | None, value: float, message: str) -> None:
+    if progress_callback is None:
+        return
+    progress_callback(max(0.0, min(1.0, value)), message)
+
+
+def transcribe_ipus(
+    audio_path: str | Path,
+    model_name: str = "turbo",
+    pause_threshold_ms: int = DEFAULT_PAUSE_THRESHOLD_MS,
+    beam_size: int = 5,
+    language: str = "ja",
+    device: str | None = None,
+    device_index: int | None = None,
+    segment_buffer_s: float = 0.1,
+    progress_callback: ProgressCallback | None = None,
+    use_temp_files: bool = False,
+    batch_size: int = 1,
+    device_indices: list[int] | None = None,
+    profile: str | None = None,
+    cpu_threads: int | None = None,
+    num_workers: int | None = None,
+    use_transcription_cache: bool = True,
+    long_form_window_s: float | None = None,
+    long_form_overlap_s: float = 30.0,
+    use_diarization_cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Perform diarization and whisper transcription, then group words into IPUs.
+
+    - ``device``, ``device_index``, ``device_indices``: where models run;
+      several indices spread Whisper over GPUs.
+    - ``profile``, ``cpu_threads``, ``num_workers``, ``batch_size``: Whisper
+      performance settings (profile default from ``autotune_performance_profile``).
+    - ``long_form_window_s``, ``long_form_overlap_s``: diarize in overlapping
+      windows instead of the whole file.
+    - ``use_diarization_cache``, ``use_transcription_cache``: reuse earlier
+      diarization turns and chunk texts.
+    - ``use_temp_files``: pass chunks to Whisper as temporary wavs (debugging).
+
+    See the README for details.
+    """
+    source = Path(audio_path).expanduser().resolve()
+    _report_progress(progress_callback, 0.01, "音声を読み込んでいます")
+    with open_audio(source) as audio_source:
+        sample_rate = audio_source.sample_rate
+        total_samples = len(audio_source)
+        read_samples = audio_source.read
+
+        def load_audio(job: dict) -> np.ndarray:
+            audio = read_samples(
+                max(int(job["start"] * sample_rate), 0),
+                min(int(job["end"] * sample_rate), total_samples),
+            )
+            return audio if use_temp_files else _resample_for_whisper(audio, sample_rate)
+
+        _report_progress(progress_callback, 0.05, "モデルを準備しています")
+        runtime_device, device_index, whisper_device, models = _prepare_whisper_models(
+            model_name, device, device_index, device_indices, profile, cpu_threads, num_workers
         )
 
+        cache_path = None
+        speaker_diarization = None
+        if use_diarization_cache:
+            cache_path = _diarization_cache_path(source, long_form_window_s, long_form_overlap_s)
+            speaker_diarization = _load_cached_diarization(cache_path)
+
+        if speaker_diarization is not None:
+            _report_progress(progress_callback, 0.25, "保存済みの話者分離結果を使います")
+        elif long_form_window_s:
+            pipeline = _get_diarization_pipeline(runtime_device, device_index)
+            _report_progress(progress_callback, 0.12, "話者分離を実行しています")
+
+            def window_progress(done: int, total: int) -> None:
+                _report_progress(
+                    progress_callback,
+                    0.12 + 0.13 * (done / max(total, 1)),
+                    f"話者分離を実行しています {done}/{total}",
+                )
+
+            speaker_diarization = _diarize_long_form(
+                pipeline,
+                audio_source,
+                long_form_window_s,
+                long_form_overlap_s,
+                progress=window_progress,
+            )
+            if cache_path is not None:
+                _save_cached_diarization(cache_path, speaker_diarization)
+        else:
+            pipeline = _get_diarization_pipeline(runtime_device, device_index)
+            _report_progress(progress_callback, 0.12, "話者分離を実行しています")
+            import torch
+
+            waveform = torch.from_numpy(audio_source.read()).unsqueeze(0)
+            with ProgressHook() as hook:
+                diarization = pipeline({"waveform": waveform, "sample_rate": sample_rate}, hook=hook)
+            del waveform
+            speaker_diarization = diarization.speaker_diarization
+            if cache_path is not None:
+                _save_cached_diarization(cache_path, speaker_diarization, _window_speaker_embeddings(diarization))
+
+        pause_threshold_s = max(pause_threshold_ms, 0) / 1000.0
+        merged_turns = merge_consecutive_turns(speaker_diarization, max_gap_s=pause_threshold_s)
+        _report_progress(progress_callback, 0.25, f"話者区間を処理しています 0/{len(merged_turns)}")
+
+        def turn_progress(done: int, total: int) -> None:
+            _report_progress(
+                progress_callback,
+                0.25 + 0.20 * (done / max(total, 1)),
+                f"無音区間を検出しています {done}/{total}",
+            )
+
+        speech_chunks = _detect_speech_chunks(
+            merged_turns,
+            read_samples,
+            sample_rate,
+            total_samples,
+            segment_buffer_s,
+            pause_threshold_s,
+            progress=turn_progress,
+        )
+        chunk_jobs = _build_chunk_jobs(speech_chunks, sample_rate, total_samples, segment_buffer_s)
+
+        def chunk_progress(done: int, total: int) -> None:
+            _report_progress(
+                progress_callback,
+                0.45 + 0.53 * (done / max(total, 1)),
+                f"書き起こしています {done}/{total}",
+            )
+
+        texts = _transcribe_chunk_jobs(
+            chunk_jobs,
+            load_audio,
+            models,
+            model_name,
+            whisper_device,
+            beam_size,
+            language,
+            batch_size=batch_size,
+            use_temp_files=use_temp_files,
+            sample_rate=sample_rate,
+            progress=chunk_progress,
+            cache=get_transcription_cache() if use_transcription_cache else None,
+        )
+    ipus = _build_ipu_rows(source.stem, chunk_jobs, texts)
+    _report_progress(progress_callback, 1.0, "IPU書き起こしが完了しました")
+    return pd.DataFrame(ipus)
+
+
+def transcribe_channel_ipus(
+    channel_paths: list[str | Path],
+    filename: str | None = None,
+    model_name: str = "turbo",
+    pause_threshold_ms: int = DEFAULT_PAUSE_THRESHOLD_MS,
+    beam_size: int = 5,
+    language: str = "ja",
+    device: str | None = None,
+    device_index: int | None = None,
+    segment_buffer_s: float = 0.1,
+    progress_callback: ProgressCallback | None = None,
+    batch_size: int = 1,
+    device_indices: list[int] | None = None,
+    profile: str | None = None,
+    cpu_threads: int | None = None,
+    num_workers: int | None = None,
+    use_transcription_cache: bool = True,
+) -> pd.DataFrame:
+    """
+    Transcribe a recording with one speaker per channel, skipping diarization.
+
+    Channel ``n`` (counting from 0) becomes speaker ``A``, ``B``, ... in order.
+    Channels are silence-segmented in parallel threads, in bounded windows
+    (see ``_detect_channel_speech_chunks``), and their chunks are
+    transcribed together, so batching and multi-GPU sharding mix channels.
+    Rows are returned sorted by start time.
+    """
+    sources = [Path(path).expanduser().resolve() for path in channel_paths]
+    if not sources:
+        raise ValueError("channel_paths is empty")
+    filename = filename or sources[0].stem
+    pause_threshold_s = max(pause_threshold_ms, 0) / 1000.0
+
+    _report_progress(progress_callback, 0.01, "モデルを準備しています")
+    _, _, whisper_device, models = _prepare_whisper_models(
+        model_name, device, device_index, device_indices, profile, cpu_threads, num_workers
+    )
+
+    with ExitStack() as open_sources:
+        def segment_channel(channel_number: int, source: Path) -> tuple[AudioSource, list[dict]]:
+            audio_source = open_sources.enter_context(open_audio(source))
+            sample_rate = audio_source.sample_rate
+            speech_chunks = _detect_channel_speech_chunks(
+                audio_source, f"SPEAKER_{channel_number:02d}", pause_threshold_s
+            )
+            chunk_jobs = _build_chunk_jobs(speech_chunks, sample_rate, len(audio_source), segment_buffer_s)
+            for job in chunk_jobs:
+                job["channel"] = channel_number
+            return audio_source, chunk_jobs
+
+        _report_progress(progress_callback, 0.1, f"チャンネルごとに無音区間を検出しています 0/{len(sources)}")
+        channel_sources: dict[int, AudioSource] = {}
+        chunk_jobs: list[dict] = []
+        with ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="tranosuke_channel") as executor:
+            futures = {
+                executor.submit(segment_channel, channel_number, source): channel_number
+                for channel_number, source in enumerate(sources)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                audio_source, jobs = future.result()
+                channel_sources[futures[future]] = audio_source
+                chunk_jobs.extend(jobs)
+                _report_progress(
+                    progress_callback,
+                    0.1 + 0.2 * (done / len(sources)),
+                    f"チャンネルごとに無音区間を検出しています {done}/{len(sources)}",
+                )
+        chunk_jobs.sort(key=lambda job: (float(job["chunk"]["start"]), job["channel"]))
+
+        def load_audio(job: dict) -> np.ndarray:
+            audio_source = channel_sources[job["channel"]]
+            audio = audio_source.read(
+                int(job["start"] * audio_source.sample_rate),
+                int(job["end"] * audio_source.sample_rate),
+            )
+            return _resample_for_whisper(audio, audio_source.sample_rate)
+
+        def chunk_progress(done: int, total: int) -> None:
+            _report_progress(
+                progress_callback,
+                0.3 + 0.68 * (done / max(total, 1)),
+                f"書き起こしています {done}/{total}",
+            )
+
+        texts = _transcribe_chunk_jobs(
+            chunk_jobs,
+            load_audio,
+            models,
+            model_name,
+            whisper_device,
+            beam_size,
+            language,
+            batch_size=batch_size,
+            progress=chunk_progress,
+            cache=get_transcription_cache() if use_transcription_cache else None,
+        )
+    ipus = _build_ipu_rows(filename, chunk_jobs, texts)
     _report_progress(progress_callback, 1.0, "IPU書き起こしが完了しました")
     return pd.DataFrame(ipus)
 
 
+def autotune_performance_profile(
+    audio_path: str | Path | None = None,
+    model_name: str = "turbo",
+    beam_size: int = 5,
+    language: str = "ja",
+    device_index: int | None = None,
+    save: bool = True,
+) -> tuple[str, dict[str, float]]:
+    """
+    Time every profile usable on this machine and save the fastest one.
+
+    Each profile transcribes ``audio_path`` (``sample/sample.wav`` by default)
+    once after a short warm-up. The winner is stored as ``WHISPER_PROFILE`` in
+    ``~/.tranosuke/config.yaml``. Returns the winner and seconds per profile.
+    """
+    source = Path(audio_path).expanduser().resolve() if audio_path else SAMPLE_AUDIO_PATH
+    waveform, sample_rate = torchaudio.load(str(source))
+    if waveform.ndim > 1 and waveform.shape[0] > 1:
+        waveform = waveform.mean(dim=0, keepdim=True)
+    audio = _to_whisper_audio(waveform, sample_rate)
+    warmup = audio[: int(5 * WHISPER_SAMPLE_RATE)]
+
+    cuda_available = detect_device() == "cuda"
+    timings = {}
+    for name, settings in PERFORMANCE_PROFILES.items():
+        if settings.device == "cuda" and not cuda_available:
+            continue
+        kwargs = {
+            "device": settings.device,
+            "compute_type": settings.compute_type,
+            "cpu_threads": settings.cpu_threads,
+            "num_workers": settings.num_workers,
+        }
+        if settings.device == "cuda":
+            kwargs["device_index"] = device_index or 0
+        try:
+            whisper_model = WhisperModel(model_name, **kwargs)
+            _transcribe_segment_text(whisper_model, warmup, beam_size, language)
+            started = time.perf_counter()
+            _transcribe_segment_text(whisper_model, audio, beam_size, language)
+            timings[name] = time.perf_counter() - started
+        except (RuntimeError, ValueError) as error:
+            print(f"autotune skipped {name}: {error}")
+        finally:
+            whisper_model = None
+
+    if not timings:
+        raise RuntimeError("No performance profile could be run on this machine.")
+
+    best = min(timings, key=timings.get)
+    if save:
+        config = read_user_config()
+        config["WHISPER_PROFILE"] = best
+        write_user_config(config)
+    return best, timings
+
+
 def transcribe_media_to_ipu_csv(
     input_path: str | Path,
     output_dir: str | Path | None = None,
@@ -445,27 +1301,68 @@ def transcribe_media_to_ipu_csv(
     device_index: int | None = None,
     segment_buffer_s: float = 0.1,
     progress_callback: ProgressCallback | None = None,
+    batch_size: int = 1,
+    device_indices: list[int] | None = None,
+    profile: str | None = None,
+    cpu_threads: int | None = None,
+    num_workers: int | None = None,
+    use_transcription_cache: bool = True,
+    long_form_window_s: float | None = None,
+    long_form_overlap_s: float = 30.0,
+    channel_speakers: bool = False,
+    use_diarization_cache: bool = True,
 ) -> tuple[Path, pd.DataFrame]:
     """
     Convert media to wav if needed, transcribe it, and save IPU.csv.
+
+    With ``channel_speakers`` and a multi-channel input, each channel is
+    treated as one speaker and diarization is skipped.
     """
     source = Path(input_path).expanduser().resolve()
     _report_progress(progress_callback, 0.0, "wavへ変換しています")
-    conversion = convert_media_to_wavs(source, output_dir=output_dir, split_channels=False)
+    conversion = convert_media_to_wavs(source, output_dir=output_dir, split_channels=channel_speakers)
 
     def transcribe_progress(value: float, message: str) -> None:
         _report_progress(progress_callback, 0.1 + 0.85 * value, message)
 
-    df_ipu = transcribe_ipus(
-        conversion.mixed_mono_wav,
-        model_name=model_name,
-        beam_size=beam_size,
-        pause_threshold_ms=pause_threshold_ms,
-        device=device,
-        device_index=device_index,
-        segment_buffer_s=segment_buffer_s,
-        progress_callback=transcribe_progress,
-    )
+    if conversion.channel_wavs:
+        df_ipu = transcribe_channel_ipus(
+            conversion.channel_wavs,
+            filename=conversion.mixed_mono_wav.stem,
+            model_name=model_name,
+            beam_size=beam_size,
+            pause_threshold_ms=pause_threshold_ms,
+            device=device,
+            device_index=device_index,
+            segment_buffer_s=segment_buffer_s,
+            progress_callback=transcribe_progress,
+            batch_size=batch_size,
+            device_indices=device_indices,
+            profile=profile,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+            use_transcription_cache=use_transcription_cache,
+        )
+    else:
+        df_ipu = transcribe_ipus(
+            conversion.mixed_mono_wav,
+            model_name=model_name,
+            beam_size=beam_size,
+            pause_threshold_ms=pause_threshold_ms,
+            device=device,
+            device_index=device_index,
+            segment_buffer_s=segment_buffer_s,
+            progress_callback=transcribe_progress,
+            batch_size=batch_size,
+            device_indices=device_indices,
+            profile=profile,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+            use_transcription_cache=use_transcription_cache,
+            long_form_window_s=long_form_window_s,
+            long_form_overlap_s=long_form_overlap_s,
+            use_diarization_cache=use_diarization_cache,
+        )
     csv_path = conversion.mixed_mono_wav.parent / "IPU.csv"
     _report_progress(progress_callback, 0.98, "CSVへ保存しています")
     df_ipu.to_csv(csv_path, encoding="utf-8_sig", index=False)
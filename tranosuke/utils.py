@@ -1,8 +1,11 @@
 import tarfile
 import zipfile
 import shutil
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import requests
 
@@ -73,6 +76,24 @@ def download_and_extract(url: str, destination_dir: str | Path, archive_name: st
     return target_dir
 
 
+class IntervalIndex:
+    """Sorted interval starts and ends for neighbour boundary lookups in O(log n)."""
+
+    def __init__(self, starts: Iterable[float], ends: Iterable[float]) -> None:
+        self._starts = sorted(float(value) for value in starts)
+        self._ends = sorted(float(value) for value in ends)
+
+    def previous_end(self, time: float, default: float = 0.0) -> float:
+        """Return the latest interval end at or before ``time``."""
+        index = bisect_right(self._ends, time)
+        return self._ends[index - 1] if index else default
+
+    def next_start(self, time: float, default: float) -> float:
+        """Return the earliest interval start at or after ``time``."""
+        index = bisect_left(self._starts, time)
+        return self._starts[index] if index < len(self._starts) else default
+
+
 def float_to_timecode(value: float) -> str | None:
     """Convert seconds into a zero-padded fixed-width millisecond-ish ID chunk."""
     if value is None:
@@ -86,6 +107,63 @@ def float_to_timecode(value: float) -> str | None:
     return text
 
 
+def _round_half_even_milliseconds(seconds: np.ndarray) -> np.ndarray:
+    """
+    Round non-negative finite seconds to whole milliseconds exactly as ``"%.3f"`` does.
+
+    ``seconds * 1000`` is inexact, so values near a midpoint are settled by
+    comparing ``2000 * seconds`` (split into two exact products) with the
+    odd integer ``2k + 1``; exact ties go to the even neighbour.
+    """
+    scaled = seconds * 1000.0
+    lower = np.floor(scaled)
+    milliseconds = np.rint(scaled)
+    near_midpoint = np.abs(scaled - lower - 0.5) < 1e-6
+    if near_midpoint.any():
+        values = seconds[near_midpoint]
+        candidate = lower[near_midpoint]
+        split = values * 134217729.0
+        high = split - (split - values)
+        low = values - high
+        # high * 2000 and low * 2000 are exact; the subtraction is exact by Sterbenz.
+        difference = (high * 2000.0 - (2.0 * candidate + 1.0)) + low * 2000.0
+        round_up = (difference > 0) | ((difference == 0) & (candidate % 2 == 1))
+        milliseconds[near_midpoint] = candidate + round_up
+    return milliseconds.astype(np.int64)
+
+
+def floats_to_timecodes(values: pd.Series) -> pd.Series:
+    """
+    Vectorized ``values.apply(float_to_timecode)`` with identical output.
+
+    Millisecond integers are formatted as fixed-width digit arrays.
+    Non-finite values and non-numeric columns go through ``float_to_timecode``.
+    """
+    if not pd.api.types.is_numeric_dtype(values.dtype) or pd.api.types.is_bool_dtype(values.dtype):
+        return values.map(float_to_timecode)
+
+    seconds = values.to_numpy(dtype=np.float64)
+    result = np.empty(len(seconds), dtype=object)
+    exact = np.isfinite(seconds) & (np.abs(seconds) < 1e12)
+
+    milliseconds = _round_half_even_milliseconds(np.abs(seconds[exact]))
+    negative = np.signbit(seconds[exact])
+    # "%.3f" without the dot keeps at least 4 digits; the ID keeps the first
+    # 6 characters, one of which is the minus sign for negative values.
+    width = np.where(negative, 5, 6)
+    digit_count = np.floor(np.log10(np.maximum(milliseconds, 1))).astype(np.int64) + 1
+    digits = milliseconds // 10 ** np.maximum(digit_count - width, 0)
+    places = 10 ** np.arange(5, -1, -1, dtype=np.int64)
+    characters = (digits[:, None] // places % 10 + ord("0")).astype(np.uint8)
+    characters[negative, 0] = ord("-")
+    result[exact] = characters.view("S6").ravel().astype(str)
+
+    fallback = ~exact
+    if fallback.any():
+        result[fallback] = [float_to_timecode(value) for value in seconds[fallback]]
+    return pd.Series(result, index=values.index, name=values.name)
+
+
 def adjust_ipu_time(df_ipu: pd.DataFrame, df_phon: pd.DataFrame) -> pd.DataFrame:
     """Replace rough IPU timings with the first and last aligned phoneme timings."""
     if df_phon.empty: